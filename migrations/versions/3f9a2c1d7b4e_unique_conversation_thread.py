@@ -0,0 +1,92 @@
+"""Deduplicate conversations and make (channel_id, thread_ts) unique
+
+Revision ID: 3f9a2c1d7b4e
+Revises:
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a2c1d7b4e'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINT_NAME = "uq_conversations_channel_thread"
+
+# One survivor per thread: prefer a processed row, then the oldest one
+_RANKED = """
+    SELECT id,
+           ROW_NUMBER() OVER (
+               PARTITION BY channel_id, thread_ts
+               ORDER BY is_processed DESC, created_at ASC, id ASC
+           ) AS rn
+    FROM conversations
+"""
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "conversations" not in inspector.get_table_names():
+        # Fresh database; create_all builds the table with the constraint
+        return
+    if any(
+        uc["name"] == CONSTRAINT_NAME
+        for uc in inspector.get_unique_constraints("conversations")
+    ):
+        return
+
+    # Fold duplicate rows into the survivor, merging the same way
+    # ConversationRepository.bulk_upsert merges tracked messages
+    op.execute(f"""
+        WITH ranked AS ({_RANKED}),
+        merged AS (
+            SELECT channel_id,
+                   thread_ts,
+                   MIN(first_message_ts) AS first_message_ts,
+                   MAX(last_message_ts) AS last_message_ts,
+                   SUM(COALESCE(message_count, 1)) AS message_count,
+                   BOOL_OR(is_error_thread) AS is_error_thread,
+                   MAX(detected_error_pattern) AS detected_error_pattern,
+                   MAX(severity) AS severity,
+                   MAX(process_after) AS process_after
+            FROM conversations
+            GROUP BY channel_id, thread_ts
+            HAVING COUNT(*) > 1
+        )
+        UPDATE conversations AS c
+        SET first_message_ts = m.first_message_ts,
+            last_message_ts = m.last_message_ts,
+            message_count = m.message_count,
+            is_error_thread = m.is_error_thread,
+            detected_error_pattern = COALESCE(c.detected_error_pattern, m.detected_error_pattern),
+            severity = COALESCE(c.severity, m.severity),
+            process_after = m.process_after
+        FROM merged AS m, ranked AS r
+        WHERE r.id = c.id
+          AND r.rn = 1
+          AND m.channel_id = c.channel_id
+          AND m.thread_ts = c.thread_ts
+    """)
+
+    op.execute(f"""
+        DELETE FROM conversations AS c
+        USING ({_RANKED}) AS r
+        WHERE r.id = c.id
+          AND r.rn > 1
+    """)
+
+    op.create_unique_constraint(
+        CONSTRAINT_NAME,
+        "conversations",
+        ["channel_id", "thread_ts"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(CONSTRAINT_NAME, "conversations", type_="unique")
@@ -0,0 +1,41 @@
+"""Track whether each solution has been added to the vector store
+
+Revision ID: 8c41e7a90d2b
+Revises: 3f9a2c1d7b4e
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e7a90d2b'
+down_revision: Union[str, None] = '3f9a2c1d7b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_solutions_is_indexed"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "solutions" not in inspector.get_table_names():
+        # Fresh database; create_all builds the table with the column
+        return
+    if any(c["name"] == "is_indexed" for c in inspector.get_columns("solutions")):
+        return
+
+    # Existing solutions were indexed in the same transaction that saved them
+    op.add_column(
+        "solutions",
+        sa.Column("is_indexed", sa.Boolean(), nullable=False, server_default=sa.true()),
+    )
+    op.create_index(INDEX_NAME, "solutions", ["is_indexed"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="solutions")
+    op.drop_column("solutions", "is_indexed")
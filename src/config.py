@@ -2,7 +2,7 @@
 RecycleOps AI Assistant - Configuration Module
 """
 import os
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Optional
 
 from pydantic import Field
@@ -27,12 +27,14 @@ class Settings(BaseSettings):
         description="Comma-separated channel IDs to monitor"
     )
     
-    @property
-    def monitor_channel_ids(self) -> list[str]:
-        """Parse monitor channels into a list."""
+    @cached_property
+    def monitor_channel_ids(self) -> frozenset[str]:
+        """Parse monitor channels once into a set for O(1) lookups."""
         if not self.slack_monitor_channels:
-            return []
-        return [ch.strip() for ch in self.slack_monitor_channels.split(",") if ch.strip()]
+            return frozenset()
+        return frozenset(
+            ch.strip() for ch in self.slack_monitor_channels.split(",") if ch.strip()
+        )
     
     # --- Google Gemini Configuration ---
     google_api_key: str = Field(..., description="Google AI API Key")
@@ -89,6 +91,14 @@ class Settings(BaseSettings):
         default=True,
         description="Enable automatic solution suggestions for new errors"
     )
+    proactive_min_similarity: float = Field(
+        default=0.65,
+        description="Minimum best-match similarity required to generate a proactive suggestion"
+    )
+    semantic_cache_distance_threshold: float = Field(
+        default=0.1,
+        description="Maximum cosine distance for a search to reuse a cached paraphrase's results"
+    )
     
     # --- Logging ---
     log_level: str = Field(default="INFO")
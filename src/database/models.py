@@ -16,6 +16,7 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    UniqueConstraint,
     Enum as SQLEnum,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
@@ -73,6 +74,8 @@ class Solution(Base):
     
     # Status and metrics
     verified: Mapped[bool] = mapped_column(Boolean, default=False)
+    # False while the solution is waiting to be added to the vector store
+    is_indexed: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
     success_count: Mapped[int] = mapped_column(Integer, default=0)
     failure_count: Mapped[int] = mapped_column(Integer, default=0)
     
@@ -156,6 +159,7 @@ class Conversation(Base):
     
     # Unique constraint on channel + thread
     __table_args__ = (
+        UniqueConstraint("channel_id", "thread_ts", name="uq_conversations_channel_thread"),
         {"sqlite_autoincrement": True},
     )
     
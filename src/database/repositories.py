@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from sqlalchemy import select, update, and_, or_, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
@@ -44,6 +45,7 @@ class SolutionRepository:
         created_by: Optional[str] = None,
         machine_type: Optional[str] = None,
         location: Optional[str] = None,
+        is_indexed: bool = True,
     ) -> Solution:
         """Create a new solution."""
         solution = Solution(
@@ -59,6 +61,7 @@ class SolutionRepository:
             created_by=created_by,
             machine_type=machine_type,
             location=location,
+            is_indexed=is_indexed,
         )
         self.session.add(solution)
         await self.session.flush()
@@ -70,6 +73,24 @@ class SolutionRepository:
         )
         return solution
     
+    async def get_unindexed(self, limit: int = 100) -> list[Solution]:
+        """Get solutions that are not in the vector store yet, oldest first."""
+        result = await self.session.execute(
+            select(Solution)
+            .where(Solution.is_indexed == False)
+            .order_by(Solution.created_at)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def mark_indexed(self, solution_ids: list[uuid.UUID]) -> None:
+        """Mark solutions as added to the vector store."""
+        await self.session.execute(
+            update(Solution)
+            .where(Solution.id.in_(solution_ids))
+            .values(is_indexed=True)
+        )
+    
     async def get_by_id(self, solution_id: uuid.UUID) -> Optional[Solution]:
         """Get a solution by ID."""
         result = await self.session.execute(
@@ -151,48 +172,127 @@ class ConversationRepository:
         detected_error_pattern: Optional[str] = None,
         severity: Optional[SeverityLevel] = None,
     ) -> Conversation:
-        """Create or update a conversation record."""
-        # Check if conversation exists
-        result = await self.session.execute(
-            select(Conversation).where(
-                and_(
-                    Conversation.channel_id == channel_id,
-                    Conversation.thread_ts == thread_ts,
-                )
-            )
+        """
+        Create or update a conversation record.
+        
+        Issued as a single INSERT ... ON CONFLICT upsert on (channel_id, thread_ts)
+        so each tracked message costs one round-trip.
+        """
+        process_after = message_ts + timedelta(hours=12)
+        stmt = insert(Conversation).values(
+            channel_id=channel_id,
+            thread_ts=thread_ts,
+            first_message_ts=message_ts,
+            last_message_ts=message_ts,
+            message_count=1,
+            is_error_thread=is_error_thread,
+            detected_error_pattern=detected_error_pattern,
+            severity=severity,
+            process_after=process_after,
         )
-        conversation = result.scalar_one_or_none()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Conversation.channel_id, Conversation.thread_ts],
+            set_={
+                "last_message_ts": stmt.excluded.last_message_ts,
+                "message_count": Conversation.message_count + 1,
+                "is_error_thread": or_(
+                    Conversation.is_error_thread,
+                    stmt.excluded.is_error_thread,
+                ),
+                "detected_error_pattern": func.coalesce(
+                    stmt.excluded.detected_error_pattern,
+                    Conversation.detected_error_pattern,
+                ),
+                "severity": func.coalesce(stmt.excluded.severity, Conversation.severity),
+                # Reset process_after time (12-hour rule)
+                "process_after": stmt.excluded.process_after,
+                "is_processed": False,
+                "updated_at": datetime.utcnow(),
+            },
+        ).returning(Conversation)
         
-        if conversation:
-            # Update existing conversation
-            conversation.last_message_ts = message_ts
-            conversation.message_count += 1
-            if is_error_thread:
-                conversation.is_error_thread = True
-            if detected_error_pattern:
-                conversation.detected_error_pattern = detected_error_pattern
-            if severity:
-                conversation.severity = severity
-            # Reset process_after time (12-hour rule)
-            conversation.process_after = message_ts + timedelta(hours=12)
-            conversation.is_processed = False
-        else:
-            # Create new conversation
-            conversation = Conversation(
-                channel_id=channel_id,
-                thread_ts=thread_ts,
-                first_message_ts=message_ts,
-                last_message_ts=message_ts,
-                message_count=1,
-                is_error_thread=is_error_thread,
-                detected_error_pattern=detected_error_pattern,
-                severity=severity,
-                process_after=message_ts + timedelta(hours=12),
-            )
-            self.session.add(conversation)
+        result = await self.session.scalars(
+            stmt,
+            execution_options={"populate_existing": True},
+        )
+        return result.one()
+    
+    async def bulk_upsert(self, messages: list[dict]) -> int:
+        """
+        Upsert conversation records for a batch of tracked messages.
         
-        await self.session.flush()
-        return conversation
+        Messages for the same thread are merged first (PostgreSQL rejects a
+        multi-row ON CONFLICT that touches the same row twice), then written
+        with a single INSERT ... ON CONFLICT statement.
+        
+        Args:
+            messages: Dicts with channel_id, thread_ts, message_ts,
+                      is_error_thread, detected_error_pattern and severity
+            
+        Returns:
+            Number of conversation rows written
+        """
+        merged: dict[tuple[str, str], dict] = {}
+        for msg in messages:
+            key = (msg["channel_id"], msg["thread_ts"])
+            row = merged.get(key)
+            if row is None:
+                merged[key] = {
+                    "channel_id": msg["channel_id"],
+                    "thread_ts": msg["thread_ts"],
+                    "first_message_ts": msg["message_ts"],
+                    "last_message_ts": msg["message_ts"],
+                    "message_count": 1,
+                    "is_error_thread": msg["is_error_thread"],
+                    "detected_error_pattern": msg["detected_error_pattern"],
+                    "severity": msg["severity"],
+                    "process_after": msg["message_ts"] + timedelta(hours=12),
+                }
+                continue
+            
+            row["message_count"] += 1
+            row["first_message_ts"] = min(row["first_message_ts"], msg["message_ts"])
+            if msg["message_ts"] >= row["last_message_ts"]:
+                row["last_message_ts"] = msg["message_ts"]
+                row["process_after"] = msg["message_ts"] + timedelta(hours=12)
+            row["is_error_thread"] = row["is_error_thread"] or msg["is_error_thread"]
+            if msg["detected_error_pattern"]:
+                row["detected_error_pattern"] = msg["detected_error_pattern"]
+            if msg["severity"]:
+                row["severity"] = msg["severity"]
+        
+        if not merged:
+            return 0
+        
+        stmt = insert(Conversation).values(list(merged.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Conversation.channel_id, Conversation.thread_ts],
+            set_={
+                "last_message_ts": func.greatest(
+                    Conversation.last_message_ts,
+                    stmt.excluded.last_message_ts,
+                ),
+                "message_count": Conversation.message_count + stmt.excluded.message_count,
+                "is_error_thread": or_(
+                    Conversation.is_error_thread,
+                    stmt.excluded.is_error_thread,
+                ),
+                "detected_error_pattern": func.coalesce(
+                    stmt.excluded.detected_error_pattern,
+                    Conversation.detected_error_pattern,
+                ),
+                "severity": func.coalesce(stmt.excluded.severity, Conversation.severity),
+                # Reset process_after time (12-hour rule)
+                "process_after": func.greatest(
+                    Conversation.process_after,
+                    stmt.excluded.process_after,
+                ),
+                "is_processed": False,
+                "updated_at": datetime.utcnow(),
+            },
+        )
+        await self.session.execute(stmt)
+        return len(merged)
     
     async def get_pending_for_processing(
         self,
@@ -261,29 +361,34 @@ class ExpertRepository:
         display_name: Optional[str] = None,
         email: Optional[str] = None,
     ) -> Expert:
-        """Create or update an expert profile."""
-        result = await self.session.execute(
-            select(Expert).where(Expert.slack_user_id == slack_user_id)
-        )
-        expert = result.scalar_one_or_none()
+        """
+        Create or update an expert profile.
         
-        if expert:
-            if display_name:
-                expert.display_name = display_name
-            if email:
-                expert.email = email
-            expert.last_active_at = datetime.utcnow()
-        else:
-            expert = Expert(
-                slack_user_id=slack_user_id,
-                display_name=display_name,
-                email=email,
-                last_active_at=datetime.utcnow(),
-            )
-            self.session.add(expert)
+        Issued as a single INSERT ... ON CONFLICT (slack_user_id) upsert
+        that returns the resulting row.
+        """
+        now = datetime.utcnow()
+        stmt = insert(Expert).values(
+            slack_user_id=slack_user_id,
+            display_name=display_name,
+            email=email,
+            last_active_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Expert.slack_user_id],
+            set_={
+                "display_name": func.coalesce(stmt.excluded.display_name, Expert.display_name),
+                "email": func.coalesce(stmt.excluded.email, Expert.email),
+                "last_active_at": stmt.excluded.last_active_at,
+                "updated_at": now,
+            },
+        ).returning(Expert)
         
-        await self.session.flush()
-        return expert
+        result = await self.session.scalars(
+            stmt,
+            execution_options={"populate_existing": True},
+        )
+        return result.one()
     
     async def increment_response_count(self, slack_user_id: str) -> None:
         """Increment the response count for an expert."""
@@ -323,6 +428,25 @@ class ExpertRepository:
             )
         )
     
+    async def update_profile_bulk(
+        self,
+        slack_user_id: str,
+        expertise_areas: Optional[list[str]],
+        machine_types: Optional[list[str]],
+        solution_count_delta: int = 0,
+    ) -> None:
+        """Update expertise arrays and solution count in a single UPDATE."""
+        await self.session.execute(
+            update(Expert)
+            .where(Expert.slack_user_id == slack_user_id)
+            .values(
+                expertise_areas=expertise_areas,
+                machine_types=machine_types,
+                solution_count=Expert.solution_count + solution_count_delta,
+                last_active_at=datetime.utcnow(),
+            )
+        )
+    
     async def find_by_expertise(
         self,
         expertise_area: str,
@@ -361,6 +485,33 @@ class ExpertRepository:
         )
         return list(result.scalars().all())
     
+    async def find_ranked(
+        self,
+        machine_type: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 3,
+    ) -> list[Expert]:
+        """
+        Find available experts ranked by relevance in a single query.
+        
+        Ranks machine-type matches first, then expertise-area matches,
+        then by solution count.
+        """
+        order_by = []
+        if machine_type:
+            order_by.append(Expert.machine_types.contains([machine_type]).desc().nulls_last())
+        if category:
+            order_by.append(Expert.expertise_areas.contains([category]).desc().nulls_last())
+        order_by.append(Expert.solution_count.desc())
+        
+        result = await self.session.execute(
+            select(Expert)
+            .where(Expert.is_available == True)
+            .order_by(*order_by)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
     async def get_top_experts(self, limit: int = 5) -> list[Expert]:
         """Get top experts by solution count."""
         result = await self.session.execute(
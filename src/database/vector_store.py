@@ -4,6 +4,7 @@ RecycleOps AI Assistant - Vector Store
 ChromaDB integration for semantic search and solution retrieval.
 Uses Google Gemini embeddings.
 """
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 
@@ -12,7 +13,7 @@ from chromadb.config import Settings as ChromaSettings
 import structlog
 
 from src.config import settings
-from src.rag.embeddings import get_embeddings, embed_text
+from src.rag.embeddings import get_embeddings, embed_text, embed_texts
 
 
 logger = structlog.get_logger(__name__)
@@ -131,6 +132,50 @@ class VectorStore:
             solution_id=solution_id,
         )
     
+    def add_solutions(self, solutions: list[dict]) -> None:
+        """
+        Add several solutions with a single batched embedding call.
+        
+        Args:
+            solutions: Dicts with solution_id, error_pattern, solution_text
+                and optional metadata, as accepted by add_solution
+        """
+        if not solutions:
+            return
+        
+        ids = []
+        documents = []
+        metadatas = []
+        for solution in solutions:
+            error_pattern = solution["error_pattern"]
+            solution_text = solution["solution_text"]
+            
+            meta = dict(solution.get("metadata") or {})
+            meta.update({
+                "error_pattern": error_pattern[:500],
+                "solution_preview": solution_text[:500],
+            })
+            
+            ids.append(solution["solution_id"])
+            documents.append(f"Hata: {error_pattern}\n\nÇözüm: {solution_text}")
+            metadatas.append(meta)
+        
+        # One Gemini request embeds the whole batch
+        embeddings = embed_texts(documents)
+        
+        # Upsert so re-indexing a solution that did make it in is harmless
+        self.solutions.upsert(
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas,
+        )
+        
+        logger.info(
+            "Added solutions to vector store",
+            count=len(ids),
+        )
+    
     def update_solution(
         self,
         solution_id: str,
@@ -286,6 +331,7 @@ class VectorStore:
         }
 
 
+@lru_cache(maxsize=1)
 def get_vector_store() -> VectorStore:
-    """Get a VectorStore instance."""
+    """Get the shared VectorStore instance."""
     return VectorStore()
@@ -4,6 +4,9 @@ RecycleOps AI Assistant - Solution Extractor
 Extracts structured solution data from analyzed conversations.
 """
 import re
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
 from typing import Optional
 
 import structlog
@@ -11,6 +14,12 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Keyword and step patterns, compiled once at import
+_CAPS_WORD_RE = re.compile(r"\b[A-Z][A-Za-z]{2,}\b")
+_PATTERN_WORD_RE = re.compile(r"\b\w{4,}\b")
+_NUMBERED_STEP_RE = re.compile(r"(\d+)[.\)]\s*(.+?)(?=\d+[.\)]|$)", re.DOTALL)
+_BULLET_STEP_RE = re.compile(r"[-•*]\s*(.+?)(?=[-•*]|$)", re.DOTALL)
+
 
 class SolutionExtractor:
     """
@@ -35,11 +44,11 @@ class SolutionExtractor:
     }
     
     # Patterns for extracting machine types
-    MACHINE_PATTERNS = [
+    MACHINE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
         r"\b([A-Z]{1,3}\d{3,4})\b",  # A1100, BC2200, etc.
         r"makine\s+(?:no|numarası)?\s*[:\s]?\s*(\d+)",
         r"(?:line|hat)\s*[:\s]?\s*(\d+)",
-    ]
+    ))
     
     def extract_solution_data(
         self,
@@ -111,27 +120,27 @@ class SolutionExtractor:
         
         return pattern
     
-    def _detect_category(self, text: str) -> Optional[str]:
-        """Detect category from text using keywords."""
-        text_lower = text.lower()
-        
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _detect_category(text: str) -> Optional[str]:
+        """Detect category from text using keywords (memoized per text)."""
         # Count keyword matches for each category
-        category_scores = {}
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
-            if score > 0:
-                category_scores[category] = score
+        category_scores = Counter(
+            _CATEGORY_OF[kw] for kw in _match_category_keywords(text.lower())
+        )
         
         if category_scores:
-            # Return category with highest score
-            return max(category_scores, key=category_scores.get)
+            # Return category with highest score, ties to the one listed first
+            return max(SolutionExtractor.CATEGORY_KEYWORDS, key=category_scores.__getitem__)
         
         return None
     
-    def _extract_machine_type(self, text: str) -> Optional[str]:
-        """Extract machine type/model from text."""
-        for pattern in self.MACHINE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _extract_machine_type(text: str) -> Optional[str]:
+        """Extract machine type/model from text (memoized per text)."""
+        for pattern in SolutionExtractor.MACHINE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).upper()
         return None
@@ -145,11 +154,7 @@ class SolutionExtractor:
         keywords = set()
         
         # Add category keywords that appear in text
-        text_lower = full_text.lower()
-        for category, kw_list in self.CATEGORY_KEYWORDS.items():
-            for kw in kw_list:
-                if kw in text_lower:
-                    keywords.add(kw)
+        keywords.update(_match_category_keywords(full_text.lower()))
         
         # Add machine type
         machine_type = self._extract_machine_type(full_text)
@@ -157,13 +162,13 @@ class SolutionExtractor:
             keywords.add(machine_type.lower())
         
         # Extract capitalized words (often technical terms)
-        caps_words = re.findall(r"\b[A-Z][A-Za-z]{2,}\b", full_text)
-        for word in caps_words[:5]:  # Limit to avoid noise
-            keywords.add(word.lower())
+        # Only the first few matches are used, so stop scanning there
+        for match in islice(_CAPS_WORD_RE.finditer(full_text), 5):  # Limit to avoid noise
+            keywords.add(match.group().lower())
         
         # Add words from error pattern
-        pattern_words = re.findall(r"\b\w{4,}\b", error_pattern.lower())
-        keywords.update(pattern_words[:10])
+        pattern_words = _PATTERN_WORD_RE.finditer(error_pattern.lower())
+        keywords.update(match.group() for match in islice(pattern_words, 10))
         
         return list(keywords)[:20]  # Limit total keywords
     
@@ -205,19 +210,46 @@ class SolutionExtractor:
             return None
         
         # Look for numbered lists
-        numbered_pattern = r"(\d+)[.\)]\s*(.+?)(?=\d+[.\)]|$)"
-        matches = re.findall(numbered_pattern, solution_text, re.DOTALL)
+        matches = _NUMBERED_STEP_RE.findall(solution_text)
         
         if matches and len(matches) >= 2:
             steps = [match[1].strip() for match in matches]
             return {"steps": steps}
         
         # Look for bullet points or dashes
-        bullet_pattern = r"[-•*]\s*(.+?)(?=[-•*]|$)"
-        matches = re.findall(bullet_pattern, solution_text, re.DOTALL)
+        matches = _BULLET_STEP_RE.findall(solution_text)
         
         if matches and len(matches) >= 2:
             steps = [match.strip() for match in matches]
             return {"steps": steps}
         
         return None
+
+
+# Keyword -> category lookup
+_CATEGORY_OF: dict[str, str] = {
+    kw: category
+    for category, kws in SolutionExtractor.CATEGORY_KEYWORDS.items()
+    for kw in kws
+}
+
+# One scanner for every category keyword. The lookahead lets occurrences
+# overlap, and longer keywords are tried first at each position.
+_ALL_CATEGORY_KEYWORDS = sorted(_CATEGORY_OF, key=len, reverse=True)
+_CATEGORY_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(kw) for kw in _ALL_CATEGORY_KEYWORDS) + "))"
+)
+
+# A keyword inside a longer matched keyword is present as well
+_CONTAINED_KEYWORDS: dict[str, tuple[str, ...]] = {
+    keyword: tuple(k for k in _ALL_CATEGORY_KEYWORDS if k != keyword and k in keyword)
+    for keyword in _ALL_CATEGORY_KEYWORDS
+}
+
+
+def _match_category_keywords(text_lower: str) -> set[str]:
+    """Find every category keyword in lowercased text in one pass."""
+    matched = {m.group(1) for m in _CATEGORY_KEYWORD_RE.finditer(text_lower)}
+    for keyword in tuple(matched):
+        matched.update(_CONTAINED_KEYWORDS[keyword])
+    return matched
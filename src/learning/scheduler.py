@@ -4,6 +4,7 @@ RecycleOps AI Assistant - Background Scheduler
 APScheduler-based scheduler for background tasks like
 the 12-hour learning rule.
 """
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -15,6 +16,7 @@ import structlog
 
 from src.config import settings
 from src.learning.analyzer import ConversationAnalyzer
+from src.services.solution_service import SolutionService
 
 
 logger = structlog.get_logger(__name__)
@@ -31,7 +33,7 @@ def get_scheduler() -> AsyncIOScheduler:
     return _scheduler
 
 
-def start_scheduler() -> None:
+def start_scheduler(event_loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
     """
     Initialize and start the background scheduler.
     
@@ -39,6 +41,10 @@ def start_scheduler() -> None:
     - Processing conversations (12-hour rule)
     - Updating expert statistics
     - Cleaning up old data
+    - Reindexing solutions missing from the vector store
+    
+    Args:
+        event_loop: Loop to run jobs on (defaults to the running loop)
     """
     global _scheduler
     
@@ -55,6 +61,7 @@ def start_scheduler() -> None:
     
     # Create scheduler
     _scheduler = AsyncIOScheduler(
+        event_loop=event_loop,
         jobstores=jobstores,
         job_defaults={
             'coalesce': True,  # Combine missed runs
@@ -90,6 +97,15 @@ def start_scheduler() -> None:
         replace_existing=True,
     )
     
+    # Add job: Retry vector indexing that failed after save (every 15 minutes)
+    _scheduler.add_job(
+        reindex_solutions,
+        trigger=IntervalTrigger(minutes=15),
+        id='reindex_solutions',
+        name='Reindex unindexed solutions',
+        replace_existing=True,
+    )
+    
     # Start the scheduler
     _scheduler.start()
     
@@ -156,6 +172,24 @@ async def update_expert_statistics() -> None:
         logger.error("Error updating expert statistics", error=str(e))
 
 
+async def reindex_solutions() -> None:
+    """
+    Queue solutions whose vector store insert failed for another attempt.
+    
+    Solutions are committed before they are embedded, so an indexing
+    failure leaves them in PostgreSQL with is_indexed=False.
+    """
+    try:
+        queued = await SolutionService.reindex_pending_solutions()
+        
+        logger.info(
+            "Solution reindexing queued",
+            queued_count=queued,
+        )
+    except Exception as e:
+        logger.error("Error reindexing solutions", error=str(e))
+
+
 async def cleanup_old_conversations() -> None:
     """
     Clean up old unprocessed conversations.
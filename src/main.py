@@ -1,6 +1,7 @@
 """
 RecycleOps AI Assistant - Main Application Entry Point
 """
+import logging
 import signal
 import sys
 import time
@@ -23,7 +24,10 @@ structlog.configure(
         structlog.processors.UnicodeDecoder(),
         structlog.dev.ConsoleRenderer(),
     ],
-    wrapper_class=structlog.stdlib.BoundLogger,
+    # Level-filtering wrapper turns disabled log calls (e.g. debug in prod) into no-ops
+    wrapper_class=structlog.make_filtering_bound_logger(
+        getattr(logging, settings.log_level.upper(), logging.INFO)
+    ),
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
     cache_logger_on_first_use=True,
@@ -32,6 +36,14 @@ structlog.configure(
 logger = structlog.get_logger(__name__)
 
 
+def _handle_sigterm(signum, frame) -> None:
+    """Flush queued writes before the container stops, then exit."""
+    logger.info("SIGTERM received, flushing pending writes...")
+    from src.slack.events import flush_pending_writes
+    flush_pending_writes()
+    sys.exit(0)
+
+
 def main():
     """Main entry point for the application."""
     logger.info("Starting RecycleOps AI Assistant...")
@@ -46,17 +58,26 @@ def main():
         vs = VectorStore()
         logger.info(f"Vector store ready: {vs.get_collection_stats()}")
         
-        # Step 2: Pre-warm embeddings
-        logger.info("Step 2/3: Warming up embeddings...")
+        # Step 2: Pre-warm embeddings and LLM connections
+        logger.info("Step 2/3: Warming up embeddings and LLM...")
         from src.rag.embeddings import embed_text
+        from src.rag.generator import warmup_llm
         _ = embed_text("warmup test")
-        logger.info("Embeddings ready!")
+        warmup_llm()
+        logger.info("Embeddings and LLM ready!")
         
         # Step 3: Now start Slack (after everything is ready)
         logger.info("Step 3/3: Starting Slack bot...")
         from src.slack.bot import create_slack_app, start_slack_app
         app = create_slack_app()
         
+        # Database and scheduled jobs run on the same loop as the handlers
+        from src.slack.events import start_background_jobs
+        start_background_jobs()
+        
+        # atexit hooks do not run on a default SIGTERM (docker stop)
+        signal.signal(signal.SIGTERM, _handle_sigterm)
+        
         logger.info("=" * 50)
         logger.info("RecycleOps AI Assistant is READY!")
         logger.info("You can now use /cozum-ara in Slack")
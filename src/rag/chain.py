@@ -3,6 +3,7 @@ RecycleOps AI Assistant - RAG Chain
 
 Orchestrates the complete RAG (Retrieval Augmented Generation) pipeline.
 """
+from functools import lru_cache
 from typing import Optional
 from dataclasses import dataclass
 
@@ -194,6 +195,7 @@ class RAGChain:
         return suggestion if suggestion else None
 
 
+@lru_cache(maxsize=1)
 def get_rag_chain() -> RAGChain:
-    """Get a RAGChain instance."""
+    """Get the shared RAGChain instance."""
     return RAGChain()
@@ -3,6 +3,7 @@ RecycleOps AI Assistant - Embeddings
 
 Google Gemini embeddings integration for text vectorization.
 """
+from functools import lru_cache
 from typing import Optional
 
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
@@ -40,6 +41,12 @@ def get_embeddings() -> GoogleGenerativeAIEmbeddings:
     return _embeddings
 
 
+@lru_cache(maxsize=1024)
+def _embed_query(text: str) -> tuple[float, ...]:
+    """Embed a query once; repeats of the same text reuse the result."""
+    return tuple(get_embeddings().embed_query(text))
+
+
 def embed_text(text: str) -> list[float]:
     """
     Embed a single text string.
@@ -50,8 +57,7 @@ def embed_text(text: str) -> list[float]:
     Returns:
         Embedding vector as list of floats
     """
-    embeddings = get_embeddings()
-    return embeddings.embed_query(text)
+    return list(_embed_query(text))
 
 
 def embed_texts(texts: list[str]) -> list[list[float]]:
@@ -3,8 +3,11 @@ RecycleOps AI Assistant - Generator
 
 LLM-based response generation using Google Gemini.
 """
+import hashlib
+from functools import lru_cache
 from typing import Optional
 
+from cachetools import LRUCache
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 import structlog
@@ -17,6 +20,10 @@ logger = structlog.get_logger(__name__)
 # Singleton LLM instance
 _llm: Optional[ChatGoogleGenerativeAI] = None
 
+# Retried and re-learned threads are analyzed again with the same messages;
+# keyed by a digest of the formatted conversation
+_analysis_cache: LRUCache = LRUCache(maxsize=1024)
+
 
 def get_llm() -> ChatGoogleGenerativeAI:
     """
@@ -43,6 +50,52 @@ def get_llm() -> ChatGoogleGenerativeAI:
     return _llm
 
 
+def warmup_llm() -> None:
+    """
+    Warm up the LLM client with a minimal request.
+    
+    Establishes the underlying connection (and TLS session) at startup so
+    the first proactive reply after boot does not pay the handshake cost.
+    The reply is capped at a single token so the ping costs next to nothing.
+    Failures are logged and ignored; the client will connect lazily instead.
+    """
+    try:
+        get_llm().bind(max_output_tokens=1).invoke([HumanMessage(content="ping")])
+    except Exception as e:
+        logger.warning("LLM warmup failed", error=str(e))
+
+
+# Prompt budgets (in approximate tokens) for variable-length prompt sections
+CONTEXT_TOKEN_BUDGET = 400
+SOLUTION_PREVIEW_TOKEN_BUDGET = 150
+
+# Rough characters-per-token ratio for Gemini tokenization of mixed TR/EN text
+_CHARS_PER_TOKEN = 4
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Clip text to an approximate token budget.
+    
+    Cuts at the last word boundary inside the budget so that partial
+    words are not sent to the LLM.
+    
+    Args:
+        text: Text to clip
+        max_tokens: Approximate maximum number of tokens
+        
+    Returns:
+        Clipped text (unchanged if already within budget)
+    """
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    if not text or len(text) <= max_chars:
+        return text or ""
+    
+    clipped = text[:max_chars]
+    cut = clipped.rfind(" ")
+    return clipped[:cut] if cut > 0 else clipped
+
+
 # System prompts for different use cases
 SYSTEM_PROMPTS = {
     "solution_search": """Sen bir teknik destek asistanısın. Görevin, makine arızaları ve teknik sorunlar için 
@@ -93,6 +146,22 @@ Yanıtlarında:
 }
 
 
+@lru_cache(maxsize=256)
+def _render_experts(experts: tuple[tuple[str, str, tuple[str, ...], int], ...]) -> str:
+    """
+    Render the experts block of the expert-suggestion prompt.
+    
+    Cached on the (id, name, areas, count) tuples so the same expert set
+    always yields a byte-identical prompt prefix.
+    """
+    experts_context = ""
+    for _, name, areas, count in experts:
+        experts_context += f"\n- {name}: "
+        experts_context += f"Uzmanlık: {', '.join(areas)}, "
+        experts_context += f"Çözüm sayısı: {count}"
+    return experts_context
+
+
 class ResponseGenerator:
     """
     LLM-based response generator for various use cases.
@@ -121,9 +190,17 @@ class ResponseGenerator:
         # Build context from retrieved solutions
         solutions_context = ""
         for i, solution in enumerate(retrieved_solutions, 1):
+            preview = _truncate_to_tokens(
+                solution.get('metadata', {}).get('solution_preview', solution.get('document', 'N/A')),
+                SOLUTION_PREVIEW_TOKEN_BUDGET,
+            )
             solutions_context += f"\n--- Çözüm {i} (Benzerlik: {solution.get('similarity', 0):.0%}) ---\n"
             solutions_context += f"Hata: {solution.get('metadata', {}).get('error_pattern', 'N/A')}\n"
-            solutions_context += f"Çözüm: {solution.get('metadata', {}).get('solution_preview', solution.get('document', 'N/A'))}\n"
+            solutions_context += f"Çözüm: {preview}\n"
+        
+        # Clip conversation context before prompt assembly
+        if conversation_context:
+            conversation_context = _truncate_to_tokens(conversation_context, CONTEXT_TOKEN_BUDGET)
         
         # Build the prompt
         user_message = f"""Kullanıcı Sorusu: {query}
@@ -131,7 +208,7 @@ class ResponseGenerator:
 Bulunan Geçmiş Çözümler:
 {solutions_context if solutions_context else "Henüz kayıtlı çözüm bulunamadı."}
 
-{f"Konuşma Bağlamı: {conversation_context[:500]}" if conversation_context else ""}
+{f"Konuşma Bağlamı: {conversation_context}" if conversation_context else ""}
 
 Lütfen bu bilgilere dayanarak kullanıcıya yardımcı ol. Eğer uygun bir çözüm bulunduysa özetle, 
 bulunamadıysa alternatif öneriler sun."""
@@ -171,6 +248,12 @@ bulunamadıysa alternatif öneriler sun."""
             text = msg.get("text", "")
             conversation_text += f"[{user}]: {text}\n\n"
         
+        cache_key = hashlib.blake2b(conversation_text.encode(), digest_size=16).digest()
+        cached = _analysis_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Conversation analysis cache hit", message_count=len(messages))
+            return dict(cached)
+        
         user_message = f"""Aşağıdaki teknik destek konuşmasını analiz et ve sorun-çözüm bilgilerini çıkar:
 
 {conversation_text}
@@ -199,7 +282,8 @@ BASARILI: [evet/hayır]"""
             success=result.get("successful", False),
         )
         
-        return result
+        _analysis_cache[cache_key] = result
+        return dict(result)
     
     def _parse_analysis_response(self, response: str) -> dict:
         """Parse the structured analysis response."""
@@ -254,6 +338,15 @@ BASARILI: [evet/hayır]"""
         if not similar_solutions:
             return ""
         
+        # Skip the LLM round-trip when even the best match is too weak to help
+        best_similarity = max((s.get("similarity", 0) for s in similar_solutions), default=0)
+        if best_similarity < settings.proactive_min_similarity:
+            logger.debug(
+                "Skipping proactive suggestion, matches too weak",
+                best_similarity=best_similarity,
+            )
+            return ""
+        
         solutions_context = ""
         for i, solution in enumerate(similar_solutions[:2], 1):
             similarity = solution.get("similarity", 0)
@@ -297,17 +390,23 @@ olası çözümü öner. 2-3 cümleyi geçme."""
         if not available_experts:
             return "Bu konuda uzman önerisi bulunamadı."
         
-        experts_context = ""
-        for expert in available_experts[:3]:
-            experts_context += f"\n- {expert.get('display_name', 'Unknown')}: "
-            experts_context += f"Uzmanlık: {', '.join(expert.get('expertise_areas', [])[:3])}, "
-            experts_context += f"Çözüm sayısı: {expert.get('solution_count', 0)}"
+        experts_context = _render_experts(tuple(
+            (
+                expert.get("slack_user_id", ""),
+                expert.get("display_name", "Unknown"),
+                tuple(expert.get("expertise_areas", [])[:3]),
+                expert.get("solution_count", 0),
+            )
+            for expert in available_experts[:3]
+        ))
         
-        user_message = f"""Sorun: {error_text}
-
-Uygun uzmanlar:
+        # Keep the experts block first and the error text last so the
+        # prompt prefix stays stable across calls
+        user_message = f"""Uygun uzmanlar:
 {experts_context}
 
+Sorun: {error_text}
+
 En uygun uzmanı öner ve neden bu kişiyi önerdiğini kısaca açıkla."""
 
         messages = [
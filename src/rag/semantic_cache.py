@@ -0,0 +1,129 @@
+"""
+RecycleOps AI Assistant - Semantic Cache
+
+In-process cache that serves stored responses for queries whose embeddings
+are close to a previously answered query.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import structlog
+
+
+logger = structlog.get_logger(__name__)
+
+
+class SemanticCache:
+    """
+    Response cache keyed by query embedding similarity.
+
+    Entries are grouped by a scope key (e.g. metadata filters) so a response
+    cached for one scope is never served for another. Within a scope, a
+    query hits when its cosine distance to a stored query is at most
+    distance_threshold.
+    """
+
+    def __init__(
+        self,
+        distance_threshold: float = 0.1,
+        maxsize: int = 256,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            distance_threshold: Maximum cosine distance for a hit
+            maxsize: Maximum number of cached entries
+            ttl: Seconds an entry stays valid
+            clock: Monotonic time source, in seconds
+        """
+        self.distance_threshold = distance_threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        # id -> (expires_at, scope, unit vector, response), oldest first
+        self._entries: OrderedDict[int, tuple[float, Hashable, np.ndarray, Any]] = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> Optional[np.ndarray]:
+        """Convert an embedding to a unit vector, or None if it is all zeros."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+        return vector / norm
+
+    def check(self, embedding: list[float], scope: Hashable = None) -> Optional[Any]:
+        """
+        Look up a response for a query embedding.
+
+        Args:
+            embedding: Query embedding
+            scope: Scope key the response must have been stored under
+
+        Returns:
+            The closest cached response within the threshold, or None
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        now = self._clock()
+        with self._lock:
+            self._evict_expired(now)
+
+            best_response = None
+            best_distance = self.distance_threshold
+            for _, entry_scope, entry_vector, response in self._entries.values():
+                if entry_scope != scope:
+                    continue
+                distance = 1.0 - float(np.dot(vector, entry_vector))
+                if distance <= best_distance:
+                    best_distance = distance
+                    best_response = response
+
+        if best_response is not None:
+            logger.debug("Semantic cache hit", distance=round(best_distance, 4))
+        return best_response
+
+    def store(self, embedding: list[float], response: Any, scope: Hashable = None) -> None:
+        """
+        Cache a response for a query embedding.
+
+        Args:
+            embedding: Query embedding
+            response: Response to serve for similar queries
+            scope: Scope key the response belongs to
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            now = self._clock()
+            self._evict_expired(now)
+            while len(self._entries) >= self.maxsize:
+                self._entries.popitem(last=False)
+
+            self._entries[self._next_id] = (now + self.ttl, scope, vector, response)
+            self._next_id += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_expired(self, now: float) -> None:
+        """Remove expired entries; callers must hold the lock."""
+        while self._entries:
+            entry_id, entry = next(iter(self._entries.items()))
+            if entry[0] > now:
+                break
+            del self._entries[entry_id]
@@ -3,7 +3,9 @@ RecycleOps AI Assistant - Conversation Service
 
 Service for conversation tracking and processing.
 """
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 
 import structlog
@@ -17,6 +19,11 @@ from src.learning.analyzer import ConversationAnalyzer
 
 logger = structlog.get_logger(__name__)
 
+# Write-behind batching for tracked messages
+TRACK_QUEUE_MAX_SIZE = 10_000
+TRACK_BATCH_MAX_SIZE = 256
+TRACK_BATCH_MAX_WAIT_SECONDS = 0.2
+
 
 class ConversationService:
     """
@@ -28,9 +35,133 @@ class ConversationService:
     - Processing conversations for solution extraction
     """
     
+    # Shared across instances: one write-behind queue and drain task per
+    # event loop. asyncio queues and tasks belong to the loop that created
+    # them, so each is only ever touched from its own loop.
+    _track_queues: dict[asyncio.AbstractEventLoop, tuple[asyncio.Queue, asyncio.Task]] = {}
+    
     def __init__(self):
         self.analyzer = ConversationAnalyzer()
     
+    @classmethod
+    def _get_track_queue(cls) -> asyncio.Queue:
+        """Get the running loop's tracking queue, starting its drain task if needed."""
+        loop = asyncio.get_running_loop()
+        entry = cls._track_queues.get(loop)
+        if entry is None or entry[1].done():
+            # Keep a stopped task's queue so nothing already put on it is lost
+            queue = entry[0] if entry else asyncio.Queue(maxsize=TRACK_QUEUE_MAX_SIZE)
+            entry = (queue, loop.create_task(cls._drain_track_queue(queue)))
+            cls._track_queues[loop] = entry
+        return entry[0]
+    
+    @classmethod
+    async def _drain_track_queue(cls, queue: asyncio.Queue) -> None:
+        """
+        Drain tracked messages and write them in batches.
+        
+        Collects up to TRACK_BATCH_MAX_SIZE messages or waits at most
+        TRACK_BATCH_MAX_WAIT_SECONDS after the first one, then upserts the
+        batch in one statement. Anything still queued is flushed when the
+        task is cancelled (e.g. on event loop shutdown).
+        
+        Writes are shielded from cancellation: a write in progress is
+        allowed to finish rather than being interrupted and written again.
+        """
+        loop = asyncio.get_running_loop()
+        batch: list[dict] = []
+        write: Optional[asyncio.Future] = None
+        try:
+            while True:
+                batch.append(await queue.get())
+                deadline = loop.time() + TRACK_BATCH_MAX_WAIT_SECONDS
+                while len(batch) < TRACK_BATCH_MAX_SIZE:
+                    # Not wait_for: on 3.11 it swallows a cancel that lands
+                    # as get() completes, and the flush then never returns
+                    try:
+                        async with asyncio.timeout_at(deadline):
+                            batch.append(await queue.get())
+                    except TimeoutError:
+                        break
+                
+                write = asyncio.ensure_future(cls._write_tracked_batch(batch))
+                batch = []
+                await asyncio.shield(write)
+        finally:
+            if write is not None and not write.done():
+                await write
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                await cls._write_tracked_batch(batch)
+    
+    @staticmethod
+    async def _write_tracked_batch(batch: list[dict]) -> None:
+        """Upsert a batch of tracked messages."""
+        try:
+            async with get_async_session() as session:
+                conv_repo = ConversationRepository(session)
+                written = await conv_repo.bulk_upsert(batch)
+            
+            logger.debug(
+                "Tracked message batch written",
+                messages=len(batch),
+                conversations=written,
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to write tracked messages",
+                messages=len(batch),
+                error=str(e),
+            )
+    
+    @classmethod
+    async def flush_tracked_messages(cls) -> None:
+        """
+        Stop every drain task, writing any queued messages first.
+        
+        Each queue is flushed on the loop that owns it; a stopped loop is run
+        once more from a worker thread to do so. Messages queued on a closed
+        loop cannot be written and are dropped.
+        """
+        current = asyncio.get_running_loop()
+        for loop in list(cls._track_queues):
+            if loop is current:
+                await cls._flush_track_queue()
+            elif loop.is_running():
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(cls._flush_track_queue(), loop)
+                )
+            elif not loop.is_closed():
+                await asyncio.to_thread(loop.run_until_complete, cls._flush_track_queue())
+            else:
+                queue, _ = cls._track_queues.pop(loop)
+                logger.warning(
+                    "Tracking queue loop closed, dropping messages",
+                    queued=queue.qsize(),
+                )
+    
+    @classmethod
+    async def _flush_track_queue(cls) -> None:
+        """Stop the running loop's drain task and write what is left in its queue."""
+        entry = cls._track_queues.pop(asyncio.get_running_loop(), None)
+        if entry is None:
+            return
+        
+        queue, task = entry
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        
+        # A task cancelled before its first step never reaches its finally
+        remaining = []
+        while not queue.empty():
+            remaining.append(queue.get_nowait())
+        if remaining:
+            await cls._write_tracked_batch(remaining)
+    
     async def track_message(
         self,
         channel_id: str,
@@ -47,6 +178,9 @@ class ConversationService:
         2. Detect if it's an error thread
         3. Reset the 12-hour processing timer
         
+        The database write is deferred to a background task that batches
+        messages, so this returns as soon as the message is queued.
+        
         Args:
             channel_id: Slack channel ID
             thread_ts: Thread timestamp
@@ -54,11 +188,10 @@ class ConversationService:
             user_id: Author's user ID
             text: Message text
         """
-        from src.slack.events import is_error_message, extract_error_info
+        from src.slack.events import scan_message
         
         # Check if this looks like an error
-        is_error = is_error_message(text)
-        error_info = extract_error_info(text) if is_error else {}
+        is_error, error_info = scan_message(text)
         
         # Determine severity (simple heuristic)
         severity = None
@@ -71,29 +204,26 @@ class ConversationService:
             else:
                 severity = SeverityLevel.MEDIUM
         
-        # Convert message_ts to datetime
-        try:
-            ts_float = float(message_ts)
-            msg_datetime = datetime.fromtimestamp(ts_float)
-        except (ValueError, TypeError):
-            msg_datetime = datetime.utcnow()
+        # Convert message_ts to datetime (naive UTC, matching the DB columns).
+        # Slack ts values are always "1234567890.123456", so a cheap leading-digit
+        # check replaces the try/except on this per-message path.
+        msg_datetime = (
+            datetime.fromtimestamp(float(message_ts), tz=timezone.utc)
+            if message_ts and message_ts[0].isdigit()
+            else datetime.now(timezone.utc)
+        ).replace(tzinfo=None)
         
-        async with get_async_session() as session:
-            conv_repo = ConversationRepository(session)
-            
-            await conv_repo.create_or_update(
-                channel_id=channel_id,
-                thread_ts=thread_ts,
-                message_ts=msg_datetime,
-                is_error_thread=is_error,
-                detected_error_pattern=error_info.get("error_type"),
-                severity=severity,
-            )
-            
-            await session.commit()
+        await self._get_track_queue().put({
+            "channel_id": channel_id,
+            "thread_ts": thread_ts,
+            "message_ts": msg_datetime,
+            "is_error_thread": is_error,
+            "detected_error_pattern": error_info.get("error_type"),
+            "severity": severity,
+        })
         
         logger.debug(
-            "Message tracked",
+            "Message queued for tracking",
             channel_id=channel_id,
             thread_ts=thread_ts,
             is_error=is_error,
@@ -196,3 +326,9 @@ class ConversationService:
             )
             
             return solution
+
+
+@lru_cache(maxsize=1)
+def get_conversation_service() -> ConversationService:
+    """Get the shared ConversationService instance."""
+    return ConversationService()
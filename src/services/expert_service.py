@@ -3,9 +3,14 @@ RecycleOps AI Assistant - Expert Service
 
 Expert routing and suggestion functionality.
 """
+import copy
+import threading
+from functools import lru_cache
 from typing import Optional
 
 import structlog
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.connection import get_async_session
 from src.database.repositories import ExpertRepository
@@ -14,6 +19,21 @@ from src.learning.extractor import SolutionExtractor
 
 logger = structlog.get_logger(__name__)
 
+# Expert profiles change on the order of minutes, so short-lived caches
+# absorb repeated lookups during bursts of Slack events
+_profile_cache: TTLCache = TTLCache(maxsize=512, ttl=60)
+_find_experts_cache: TTLCache = TTLCache(maxsize=512, ttl=60)
+# Lookups run on Bolt worker threads and on the shared event loop thread;
+# cachetools caches are not thread-safe
+_expert_cache_lock = threading.Lock()
+
+# Static message fragments
+_SUGGESTION_HEADER = "Bu konuda deneyimli ekip üyelerimiz:\n\n"
+_SUGGESTION_FOOTER = "\nBelki onlara danışmak istersiniz? 💡"
+
+# SolutionExtractor is stateless, so every service instance shares one
+_EXTRACTOR = SolutionExtractor()
+
 
 class ExpertService:
     """
@@ -26,7 +46,7 @@ class ExpertService:
     """
     
     def __init__(self):
-        self.extractor = SolutionExtractor()
+        self.extractor = _EXTRACTOR
     
     async def find_experts(
         self,
@@ -34,6 +54,7 @@ class ExpertService:
         machine_type: Optional[str] = None,
         category: Optional[str] = None,
         limit: int = 3,
+        session: Optional[AsyncSession] = None,
     ) -> list[dict]:
         """
         Find experts relevant to a query.
@@ -43,6 +64,7 @@ class ExpertService:
             machine_type: Optional machine type filter
             category: Optional category filter
             limit: Maximum number of experts to return
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
             List of expert dicts
@@ -55,94 +77,93 @@ class ExpertService:
         if not machine_type:
             machine_type = self.extractor._extract_machine_type(query)
         
-        async with get_async_session() as session:
-            expert_repo = ExpertRepository(session)
-            experts = []
-            
-            # First, try to find by machine type
-            if machine_type:
-                machine_experts = await expert_repo.find_by_machine_type(
-                    machine_type=machine_type,
-                    limit=limit,
-                )
-                experts.extend(machine_experts)
-            
-            # Then, find by category if we need more
-            if category and len(experts) < limit:
-                remaining = limit - len(experts)
-                category_experts = await expert_repo.find_by_expertise(
-                    expertise_area=category,
-                    limit=remaining,
-                )
-                
-                # Add experts not already in list
-                existing_ids = {e.slack_user_id for e in experts}
-                for expert in category_experts:
-                    if expert.slack_user_id not in existing_ids:
-                        experts.append(expert)
-            
-            # If still not enough, get top experts
-            if len(experts) < limit:
-                remaining = limit - len(experts)
-                top_experts = await expert_repo.get_top_experts(limit=remaining)
-                
-                existing_ids = {e.slack_user_id for e in experts}
-                for expert in top_experts:
-                    if expert.slack_user_id not in existing_ids:
-                        experts.append(expert)
-            
-            # Convert to dicts
-            return [
-                {
-                    "slack_user_id": e.slack_user_id,
-                    "display_name": e.display_name,
-                    "expertise_areas": e.expertise_areas or [],
-                    "machine_types": e.machine_types or [],
-                    "solution_count": e.solution_count,
-                    "response_count": e.response_count,
-                    "is_available": e.is_available,
-                }
-                for e in experts[:limit]
-            ]
+        cache_key = (machine_type, category, limit)
+        with _expert_cache_lock:
+            cached = _find_experts_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        # One ranked query replaces the machine > category > top fallback chain
+        experts = await self._query_experts(
+            lambda repo: repo.find_ranked(
+                machine_type=machine_type,
+                category=category,
+                limit=limit,
+            ),
+            session=session,
+        )
+        
+        # Convert to dicts
+        results = [
+            {
+                "slack_user_id": e.slack_user_id,
+                "display_name": e.display_name,
+                "expertise_areas": e.expertise_areas or [],
+                "machine_types": e.machine_types or [],
+                "solution_count": e.solution_count,
+                "response_count": e.response_count,
+                "is_available": e.is_available,
+            }
+            for e in experts
+        ]
+        with _expert_cache_lock:
+            _find_experts_cache[cache_key] = results
+        return copy.deepcopy(results)
+    
+    @staticmethod
+    async def _query_experts(
+        query,
+        session: Optional[AsyncSession] = None,
+    ) -> list:
+        """Run an ExpertRepository lookup, in its own session unless one is given."""
+        if session is not None:
+            return await query(ExpertRepository(session))
+        
+        async with get_async_session() as own_session:
+            return await query(ExpertRepository(own_session))
     
     async def suggest_experts_for_query(
         self,
         query: str,
+        session: Optional[AsyncSession] = None,
     ) -> Optional[str]:
         """
         Generate an expert suggestion message for a query.
         
         Args:
             query: The problem/error description
+            session: Optional session to reuse for the expert lookup
             
         Returns:
             Formatted suggestion message or None
         """
-        experts = await self.find_experts(query, limit=3)
+        experts = await self.find_experts(query, limit=3, session=session)
         
         if not experts:
             return None
         
         # Build suggestion message
-        message = "Bu konuda deneyimli ekip üyelerimiz:\n\n"
+        parts = [_SUGGESTION_HEADER]
         
         for expert in experts:
-            message += f"• <@{expert['slack_user_id']}>"
+            line = f"• <@{expert['slack_user_id']}>"
+            
+            areas = expert.get("expertise_areas") or ()
+            solution_count = expert.get("solution_count") or 0
             
             details = []
-            if expert.get("expertise_areas"):
-                details.append(f"Uzmanlık: {', '.join(expert['expertise_areas'][:2])}")
-            if expert.get("solution_count", 0) > 0:
-                details.append(f"{expert['solution_count']} çözüm")
+            if areas:
+                details.append(f"Uzmanlık: {', '.join(areas[:2])}")
+            if solution_count > 0:
+                details.append(f"{solution_count} çözüm")
             
             if details:
-                message += f" ({', '.join(details)})"
+                line += f" ({', '.join(details)})"
             
-            message += "\n"
-        
-        message += "\nBelki onlara danışmak istersiniz? 💡"
+            parts.append(line + "\n")
         
-        return message
+        parts.append(_SUGGESTION_FOOTER)
+        return "".join(parts)
     
     async def update_expert_from_solution(
         self,
@@ -167,33 +188,29 @@ class ExpertService:
             # Get or create expert
             expert = await expert_repo.create_or_update(slack_user_id=slack_user_id)
             
-            # Update expertise areas
-            if category:
-                current_areas = expert.expertise_areas or []
-                if category not in current_areas:
-                    current_areas.append(category)
-                    await expert_repo.update_expertise(
-                        slack_user_id=slack_user_id,
-                        expertise_areas=current_areas,
-                        machine_types=expert.machine_types,
-                    )
+            # Merge new expertise locally, then write everything in one UPDATE
+            current_areas = list(expert.expertise_areas or [])
+            if category and category not in current_areas:
+                current_areas.append(category)
             
-            # Update machine types
-            if machine_type:
-                current_machines = expert.machine_types or []
-                if machine_type not in current_machines:
-                    current_machines.append(machine_type)
-                    await expert_repo.update_expertise(
-                        slack_user_id=slack_user_id,
-                        expertise_areas=expert.expertise_areas,
-                        machine_types=current_machines,
-                    )
+            current_machines = list(expert.machine_types or [])
+            if machine_type and machine_type not in current_machines:
+                current_machines.append(machine_type)
             
-            # Increment solution count
-            await expert_repo.increment_solution_count(slack_user_id)
+            await expert_repo.update_profile_bulk(
+                slack_user_id=slack_user_id,
+                expertise_areas=current_areas,
+                machine_types=current_machines,
+                solution_count_delta=1,
+            )
             
             await session.commit()
             
+            # Rankings may change too, so every cached lookup is dropped
+            with _expert_cache_lock:
+                _profile_cache.pop(slack_user_id, None)
+                _find_experts_cache.clear()
+            
             logger.info(
                 "Updated expert profile",
                 slack_user_id=slack_user_id,
@@ -214,12 +231,17 @@ class ExpertService:
         Returns:
             Expert profile dict or None
         """
+        with _expert_cache_lock:
+            cached = _profile_cache.get(slack_user_id)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         async with get_async_session() as session:
             expert_repo = ExpertRepository(session)
             expert = await expert_repo.create_or_update(slack_user_id=slack_user_id)
             
             if expert:
-                return {
+                profile = {
                     "slack_user_id": expert.slack_user_id,
                     "display_name": expert.display_name,
                     "expertise_areas": expert.expertise_areas or [],
@@ -230,5 +252,14 @@ class ExpertService:
                     "is_available": expert.is_available,
                     "last_active_at": expert.last_active_at.isoformat() if expert.last_active_at else None,
                 }
+                with _expert_cache_lock:
+                    _profile_cache[slack_user_id] = profile
+                return copy.deepcopy(profile)
         
         return None
+
+
+@lru_cache(maxsize=1)
+def get_expert_service() -> ExpertService:
+    """Get the shared ExpertService instance."""
+    return ExpertService()
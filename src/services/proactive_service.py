@@ -4,19 +4,59 @@ RecycleOps AI Assistant - Proactive Service
 Proactive support functionality that automatically suggests solutions
 when new error messages are detected.
 """
+import asyncio
+from functools import lru_cache
 from typing import Optional
 
-from slack_sdk import WebClient
+from slack_sdk.web.async_client import AsyncWebClient
 import structlog
 
 from src.config import settings
-from src.services.solution_service import SolutionService
-from src.services.expert_service import ExpertService
+from src.database.connection import get_async_session
+from src.services.solution_service import get_solution_service
+from src.services.expert_service import get_expert_service
 from src.rag.chain import get_rag_chain
 
 
 logger = structlog.get_logger(__name__)
 
+# Static message fragments
+_PROACTIVE_HEADER = (
+    "👋 Merhaba! Bu hatayı fark ettim ve geçmiş kayıtlarımızda benzer durumlar buldum:\n\n"
+)
+_PROACTIVE_FOOTER = (
+    "---\n"
+    "💡 Bu öneri yardımcı olduysa 👍, olmadıysa 👎 ile geri bildirim verebilirsiniz."
+)
+_PROACTIVE_BLOCK = "*{i}. Benzer Durum* (Eşleşme: {sim}%)\n📋 {ep}\n✅ {ss}\n{link}\n"
+_EXPERT_HEADER = (
+    "🤔 Bu soruna benzer kayıtlı bir çözüm bulamadım.\n\n"
+    "Ancak bu konuda deneyimli ekip üyelerimiz:\n"
+)
+_EXPERT_FOOTER = "\nBelki onlara danışmak istersiniz? 💡"
+_MENTION_FOOTER = "\n💡 Daha fazla bilgi için `/search` komutunu kullanabilirsiniz."
+_NO_SOLUTION_HINT = (
+    "Bu yeni bir sorun olabilir. Çözüldüğünde `/cozum-ekle` komutuyla "
+    "kaydetmeyi unutmayın, gelecekte başkalarına yardımcı olacaktır! 🌟"
+)
+
+
+def _truncate(s: str, n: int) -> str:
+    """Shorten text to n characters, marking the cut with an ellipsis."""
+    return s if len(s) <= n else s[:n] + "..."
+
+
+def _discard(task: asyncio.Task) -> None:
+    """
+    Cancel a task whose result is no longer needed.
+    
+    The task may still fail while it unwinds (e.g. a session rollback
+    raising); retrieving its exception keeps asyncio from logging it as
+    unhandled.
+    """
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    task.cancel()
+
 
 class ProactiveService:
     """
@@ -26,16 +66,16 @@ class ProactiveService:
     suggests relevant solutions from the knowledge base.
     """
     
-    def __init__(self, slack_client: WebClient):
+    def __init__(self, slack_client: AsyncWebClient):
         """
         Initialize the proactive service.
         
         Args:
-            slack_client: Slack WebClient for posting messages
+            slack_client: Async Slack client for posting messages
         """
         self.slack_client = slack_client
-        self.solution_service = SolutionService()
-        self.expert_service = ExpertService()
+        self.solution_service = get_solution_service()
+        self.expert_service = get_expert_service()
         self.rag_chain = get_rag_chain()
     
     async def suggest_solution(
@@ -66,24 +106,49 @@ class ProactiveService:
             thread_ts=thread_ts,
         )
         
-        # Search for similar solutions
-        results = await self.solution_service.search_solutions(
+        machine_type = error_info.get("machine_type") if error_info else None
+        
+        # Look up solutions and the expert fallback concurrently; the expert
+        # result is discarded when a solution is found
+        sol_task = asyncio.create_task(self.solution_service.search_solutions(
             query=error_text,
             max_results=3,
             min_similarity=settings.similarity_threshold,
-            machine_type=error_info.get("machine_type") if error_info else None,
-        )
+            machine_type=machine_type,
+        ))
+        exp_task = asyncio.create_task(self.expert_service.find_experts(
+            query=error_text,
+            machine_type=machine_type,
+        ))
+        
+        try:
+            results = await sol_task
+        except Exception:
+            _discard(exp_task)
+            raise
         
-        if not results:
+        if results:
+            _discard(exp_task)
+        else:
             logger.debug("No similar solutions found for proactive suggestion")
             
-            # Try to suggest an expert instead
-            await self._suggest_expert(
-                channel_id=channel_id,
-                thread_ts=thread_ts,
-                error_text=error_text,
-                error_info=error_info,
-            )
+            # Suggest an expert instead
+            try:
+                experts = await exp_task
+            except Exception as e:
+                logger.error("Failed to find experts", error=str(e))
+                return False
+            
+            if experts:
+                try:
+                    await self.slack_client.chat_postMessage(
+                        channel=channel_id,
+                        thread_ts=thread_ts,
+                        text=self._format_expert_message(experts),
+                        unfurl_links=False,
+                    )
+                except Exception as e:
+                    logger.error("Failed to suggest expert", error=str(e))
             return False
         
         # Generate suggestion message
@@ -91,7 +156,7 @@ class ProactiveService:
         
         # Post suggestion in thread
         try:
-            self.slack_client.chat_postMessage(
+            await self.slack_client.chat_postMessage(
                 channel=channel_id,
                 thread_ts=thread_ts,
                 text=message,
@@ -136,8 +201,9 @@ class ProactiveService:
             query=query[:50],
         )
         
-        # Use RAG chain for intelligent response
-        rag_response = await self.rag_chain.query(
+        # Use RAG chain for intelligent response (blocking, so run it off the loop)
+        rag_response = await asyncio.to_thread(
+            self.rag_chain.query,
             question=query,
             n_results=3,
             min_similarity=0.5,  # Lower threshold for direct questions
@@ -146,12 +212,17 @@ class ProactiveService:
         if rag_response.has_solutions:
             message = self._format_mention_response(query, rag_response)
         else:
-            # No solutions found, suggest expert
-            expert_suggestion = await self.expert_service.suggest_experts_for_query(query)
+            # No solutions found, suggest expert. One session serves all
+            # expert lookups so the mention checks out a single connection.
+            async with get_async_session() as session:
+                expert_suggestion = await self.expert_service.suggest_experts_for_query(
+                    query,
+                    session=session,
+                )
             message = self._format_no_solution_response(query, expert_suggestion)
         
         try:
-            self.slack_client.chat_postMessage(
+            await self.slack_client.chat_postMessage(
                 channel=channel_id,
                 thread_ts=thread_ts,
                 text=message,
@@ -162,42 +233,19 @@ class ProactiveService:
             logger.error("Failed to respond to mention", error=str(e))
             return False
     
-    async def _suggest_expert(
-        self,
-        channel_id: str,
-        thread_ts: str,
-        error_text: str,
-        error_info: Optional[dict],
-    ) -> None:
-        """Suggest an expert when no solution is found."""
-        machine_type = error_info.get("machine_type") if error_info else None
+    def _format_expert_message(self, experts: list[dict]) -> str:
+        """Format the expert suggestion posted when no solution is found."""
+        parts = [_EXPERT_HEADER]
         
-        experts = await self.expert_service.find_experts(
-            query=error_text,
-            machine_type=machine_type,
-        )
+        for expert in experts[:3]:
+            line = f"• <@{expert['slack_user_id']}>"
+            areas = expert.get("expertise_areas") or ()
+            if areas:
+                line += f" - {', '.join(areas[:2])}"
+            parts.append(line + "\n")
         
-        if experts:
-            message = "🤔 Bu soruna benzer kayıtlı bir çözüm bulamadım.\n\n"
-            message += "Ancak bu konuda deneyimli ekip üyelerimiz:\n"
-            
-            for expert in experts[:3]:
-                message += f"• <@{expert['slack_user_id']}>"
-                if expert.get("expertise_areas"):
-                    message += f" - {', '.join(expert['expertise_areas'][:2])}"
-                message += "\n"
-            
-            message += "\nBelki onlara danışmak istersiniz? 💡"
-            
-            try:
-                self.slack_client.chat_postMessage(
-                    channel=channel_id,
-                    thread_ts=thread_ts,
-                    text=message,
-                    unfurl_links=False,
-                )
-            except Exception as e:
-                logger.error("Failed to suggest expert", error=str(e))
+        parts.append(_EXPERT_FOOTER)
+        return "".join(parts)
     
     def _format_proactive_message(
         self,
@@ -205,42 +253,46 @@ class ProactiveService:
         error_info: Optional[dict],
     ) -> str:
         """Format the proactive suggestion message."""
-        message = "👋 Merhaba! Bu hatayı fark ettim ve geçmiş kayıtlarımızda benzer durumlar buldum:\n\n"
+        parts = [_PROACTIVE_HEADER]
         
         for i, result in enumerate(results[:2], 1):
             similarity = int(result.get("similarity", 0) * 100)
-            
-            message += f"*{i}. Benzer Durum* (Eşleşme: {similarity}%)\n"
-            message += f"📋 {result.get('error_pattern', '')[:150]}\n"
-            message += f"✅ {result.get('solution_summary', result.get('solution_text', ''))[:200]}\n"
-            
-            if result.get("source_link"):
-                message += f"🔗 <{result['source_link']}|Detaylar için tıklayın>\n"
-            
-            message += "\n"
-        
-        message += "---\n"
-        message += "💡 Bu öneri yardımcı olduysa 👍, olmadıysa 👎 ile geri bildirim verebilirsiniz."
+            error_pattern = result.get("error_pattern") or ""
+            link = (
+                f"🔗 <{result['source_link']}|Detaylar için tıklayın>\n"
+                if result.get("source_link") else ""
+            )
+            parts.append(_PROACTIVE_BLOCK.format(
+                i=i,
+                sim=similarity,
+                ep=error_pattern[:150],
+                ss=result.get("solution_summary", result.get("solution_text", ""))[:200],
+                link=link,
+            ))
         
-        return message
+        parts.append(_PROACTIVE_FOOTER)
+        return "".join(parts)
     
     def _format_mention_response(self, query: str, rag_response) -> str:
         """Format response to a direct mention."""
-        message = f"🔍 *\"{query[:50]}{'...' if len(query) > 50 else ''}\"* için arama yaptım:\n\n"
-        message += rag_response.answer
-        message += "\n\n---\n"
+        parts = [
+            f"🔍 *\"{_truncate(query, 50)}\"* için arama yaptım:\n\n",
+            rag_response.answer,
+            "\n\n---\n",
+        ]
         
         if rag_response.sources:
-            message += f"📚 *Kaynaklar:* {len(rag_response.sources)} kayıt bulundu "
-            message += f"(Güven: {int(rag_response.confidence * 100)}%)\n"
+            parts.append(
+                f"📚 *Kaynaklar:* {len(rag_response.sources)} kayıt bulundu "
+                f"(Güven: {int(rag_response.confidence * 100)}%)\n"
+            )
             
             for source in rag_response.sources[:2]:
                 if source.get("error_pattern"):
-                    message += f"• {source['error_pattern'][:80]}...\n"
-        
-        message += "\n💡 Daha fazla bilgi için `/search` komutunu kullanabilirsiniz."
+                    parts.append(f"• {source['error_pattern'][:80]}...\n")
         
-        return message
+        parts.append(_MENTION_FOOTER)
+        return "".join(parts)
     
     def _format_no_solution_response(
         self,
@@ -248,13 +300,14 @@ class ProactiveService:
         expert_suggestion: Optional[str],
     ) -> str:
         """Format response when no solution is found."""
-        message = f"🤔 *\"{query[:50]}{'...' if len(query) > 50 else ''}\"* için "
-        message += "kayıtlı bir çözüm bulamadım.\n\n"
-        
-        if expert_suggestion:
-            message += expert_suggestion
-        else:
-            message += "Bu yeni bir sorun olabilir. Çözüldüğünde `/cozum-ekle` komutuyla "
-            message += "kaydetmeyi unutmayın, gelecekte başkalarına yardımcı olacaktır! 🌟"
-        
-        return message
+        return (
+            f"🤔 *\"{_truncate(query, 50)}\"* için "
+            "kayıtlı bir çözüm bulamadım.\n\n"
+            f"{expert_suggestion or _NO_SOLUTION_HINT}"
+        )
+
+
+@lru_cache(maxsize=8)
+def get_proactive_service(slack_client: AsyncWebClient) -> ProactiveService:
+    """Get the shared ProactiveService instance for a Slack client."""
+    return ProactiveService(slack_client)
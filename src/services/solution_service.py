@@ -3,20 +3,49 @@ RecycleOps AI Assistant - Solution Service
 
 Core business logic for solution search and management.
 """
+import asyncio
+import threading
 import uuid
+from functools import lru_cache
 from typing import Optional
 
 import structlog
+from cachetools import TTLCache
 
 from src.config import settings
 from src.database.connection import get_async_session
 from src.database.repositories import SolutionRepository
 from src.database.vector_store import get_vector_store
+from src.learning.extractor import SolutionExtractor
 from src.rag.chain import get_rag_chain
+from src.rag.embeddings import embed_text
+from src.rag.semantic_cache import SemanticCache
 
 
 logger = structlog.get_logger(__name__)
 
+# Write-behind batching for vector store inserts
+INDEX_QUEUE_MAX_SIZE = 1_000
+INDEX_BATCH_MAX_SIZE = 32
+INDEX_BATCH_MAX_WAIT_SECONDS = 0.2
+INDEX_WRITE_MAX_ATTEMPTS = 3
+INDEX_RETRY_BASE_DELAY_SECONDS = 1.0
+
+# Proactive monitors re-run the same error text often; a short TTL keeps
+# newly added solutions visible quickly
+_search_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+# Searches run on Bolt worker threads and on the shared event loop thread;
+# cachetools caches are not thread-safe
+_search_cache_lock = threading.Lock()
+
+# Paraphrased queries ("A1100 sıkıştı" / "A1100 şişe sıkışması") reuse results
+# of a close enough earlier query with the same filters
+_semantic_cache = SemanticCache(
+    distance_threshold=settings.semantic_cache_distance_threshold,
+    maxsize=256,
+    ttl=30,
+)
+
 
 class SolutionService:
     """
@@ -28,11 +57,183 @@ class SolutionService:
     - Updating solution metrics
     """
     
+    # Shared across instances: one write-behind queue and drain task per
+    # event loop. asyncio queues and tasks belong to the loop that created
+    # them, so each is only ever touched from its own loop.
+    _index_queues: dict[asyncio.AbstractEventLoop, tuple[asyncio.Queue, asyncio.Task]] = {}
+    
     def __init__(self):
         self.rag_chain = get_rag_chain()
         self.vector_store = get_vector_store()
     
-    def search_solutions(
+    @classmethod
+    def _get_index_queue(cls) -> asyncio.Queue:
+        """Get the running loop's vector store queue, starting its drain task if needed."""
+        loop = asyncio.get_running_loop()
+        entry = cls._index_queues.get(loop)
+        if entry is None or entry[1].done():
+            # Keep a stopped task's queue so nothing already put on it is lost
+            queue = entry[0] if entry else asyncio.Queue(maxsize=INDEX_QUEUE_MAX_SIZE)
+            entry = (queue, loop.create_task(cls._drain_index_queue(queue)))
+            cls._index_queues[loop] = entry
+        return entry[0]
+    
+    @classmethod
+    async def _drain_index_queue(cls, queue: asyncio.Queue) -> None:
+        """
+        Drain saved solutions and add them to the vector store in batches.
+        
+        Collects up to INDEX_BATCH_MAX_SIZE solutions or waits at most
+        INDEX_BATCH_MAX_WAIT_SECONDS after the first one, then embeds and
+        inserts the batch together. Anything still queued is flushed when the
+        task is cancelled (e.g. on event loop shutdown).
+        
+        Writes are shielded from cancellation: a write in progress is
+        allowed to finish rather than being interrupted and written again.
+        """
+        loop = asyncio.get_running_loop()
+        batch: list[dict] = []
+        write: Optional[asyncio.Future] = None
+        try:
+            while True:
+                batch.append(await queue.get())
+                deadline = loop.time() + INDEX_BATCH_MAX_WAIT_SECONDS
+                while len(batch) < INDEX_BATCH_MAX_SIZE:
+                    # Not wait_for: on 3.11 it swallows a cancel that lands
+                    # as get() completes, and the flush then never returns
+                    try:
+                        async with asyncio.timeout_at(deadline):
+                            batch.append(await queue.get())
+                    except TimeoutError:
+                        break
+                
+                write = asyncio.ensure_future(cls._write_index_batch(batch))
+                batch = []
+                await asyncio.shield(write)
+        finally:
+            if write is not None and not write.done():
+                await write
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                await cls._write_index_batch(batch)
+    
+    @staticmethod
+    async def _write_index_batch(batch: list[dict]) -> None:
+        """
+        Embed and insert a batch of solutions into the vector store.
+        
+        Retries with exponential backoff. Solutions that still fail keep
+        is_indexed=False and are picked up by reindex_pending_solutions.
+        """
+        solution_ids = [item["solution_id"] for item in batch]
+        for attempt in range(1, INDEX_WRITE_MAX_ATTEMPTS + 1):
+            try:
+                await asyncio.to_thread(get_vector_store().add_solutions, batch)
+                break
+            except Exception as e:
+                if attempt == INDEX_WRITE_MAX_ATTEMPTS:
+                    logger.error(
+                        "Failed to index solutions, left for reindexing",
+                        solution_ids=solution_ids,
+                        error=str(e),
+                    )
+                    return
+                logger.warning(
+                    "Indexing solutions failed, retrying",
+                    solution_ids=solution_ids,
+                    attempt=attempt,
+                    error=str(e),
+                )
+                await asyncio.sleep(INDEX_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+        
+        with _search_cache_lock:
+            _search_cache.clear()
+        _semantic_cache.clear()
+        
+        try:
+            async with get_async_session() as session:
+                await SolutionRepository(session).mark_indexed(
+                    [uuid.UUID(solution_id) for solution_id in solution_ids]
+                )
+        except Exception as e:
+            # Searchable already; a later reindex just upserts them again
+            logger.error(
+                "Failed to mark solutions as indexed",
+                solution_ids=solution_ids,
+                error=str(e),
+            )
+    
+    @classmethod
+    async def flush_indexed_solutions(cls) -> None:
+        """
+        Stop every drain task, indexing any queued solutions first.
+        
+        Each queue is flushed on the loop that owns it; a stopped loop is run
+        once more from a worker thread to do so. Solutions queued on a closed
+        loop keep is_indexed=False and are left for reindex_pending_solutions.
+        """
+        current = asyncio.get_running_loop()
+        for loop in list(cls._index_queues):
+            if loop is current:
+                await cls._flush_index_queue()
+            elif loop.is_running():
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(cls._flush_index_queue(), loop)
+                )
+            elif not loop.is_closed():
+                await asyncio.to_thread(loop.run_until_complete, cls._flush_index_queue())
+            else:
+                queue, _ = cls._index_queues.pop(loop)
+                logger.warning(
+                    "Index queue loop closed, left for reindexing",
+                    queued=queue.qsize(),
+                )
+    
+    @classmethod
+    async def _flush_index_queue(cls) -> None:
+        """Stop the running loop's drain task and index what is left in its queue."""
+        entry = cls._index_queues.pop(asyncio.get_running_loop(), None)
+        if entry is None:
+            return
+        
+        queue, task = entry
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        
+        # A task cancelled before its first step never reaches its finally
+        remaining = []
+        while not queue.empty():
+            remaining.append(queue.get_nowait())
+        if remaining:
+            await cls._write_index_batch(remaining)
+    
+    @classmethod
+    async def reindex_pending_solutions(cls, limit: int = 100) -> int:
+        """
+        Queue solutions that were saved but never made it into the vector store.
+        
+        Args:
+            limit: Maximum number of solutions to queue
+            
+        Returns:
+            Number of solutions queued
+        """
+        async with get_async_session() as session:
+            solutions = await SolutionRepository(session).get_unindexed(limit=limit)
+        
+        queue = cls._get_index_queue()
+        for solution in solutions:
+            await queue.put(_index_item(solution))
+        
+        if solutions:
+            logger.info("Queued unindexed solutions", count=len(solutions))
+        return len(solutions)
+    
+    async def search_solutions(
         self,
         query: str,
         max_results: int = 3,
@@ -53,8 +254,32 @@ class SolutionService:
         Returns:
             List of matching solutions
         """
-        # Use RAG chain for intelligent search
-        rag_response = self.rag_chain.query(
+        cache_key = (query, max_results, min_similarity, category, machine_type)
+        with _search_cache_lock:
+            cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        # The embedding is cached, so the RAG chain below reuses it on a miss
+        query_embedding = await asyncio.to_thread(embed_text, query)
+        # Queries naming different machines embed close together, so the
+        # machine named in the text scopes the entry when no filter is given
+        scope = (
+            max_results,
+            min_similarity,
+            category,
+            machine_type or SolutionExtractor._extract_machine_type(query),
+        )
+        cached = _semantic_cache.check(query_embedding, scope=scope)
+        if cached is not None:
+            with _search_cache_lock:
+                _search_cache[cache_key] = cached
+            return list(cached)
+        
+        # Use RAG chain for intelligent search. The chain (embedding, vector
+        # search and LLM call) is blocking, so keep it off the event loop.
+        rag_response = await asyncio.to_thread(
+            self.rag_chain.query,
             question=query,
             n_results=max_results,
             min_similarity=min_similarity,
@@ -80,7 +305,10 @@ class SolutionService:
             results_count=len(results),
         )
         
-        return results
+        with _search_cache_lock:
+            _search_cache[cache_key] = results
+        _semantic_cache.store(query_embedding, results, scope=scope)
+        return list(results)
     
     async def get_solution_by_id(self, solution_id: str) -> Optional[dict]:
         """
@@ -92,29 +320,31 @@ class SolutionService:
         Returns:
             Solution dict or None
         """
+        # Reject malformed IDs before checking out a pool connection
+        try:
+            uid = uuid.UUID(solution_id)
+        except ValueError:
+            logger.warning(f"Invalid solution ID: {solution_id}")
+            return None
+        
         async with get_async_session() as session:
             solution_repo = SolutionRepository(session)
+            solution = await solution_repo.get_by_id(uid)
             
-            try:
-                uid = uuid.UUID(solution_id)
-                solution = await solution_repo.get_by_id(uid)
-                
-                if solution:
-                    return {
-                        "id": str(solution.id),
-                        "error_pattern": solution.error_pattern,
-                        "error_category": solution.error_category,
-                        "solution_summary": solution.solution_summary,
-                        "solution_text": solution.solution_text,
-                        "solution_steps": solution.solution_steps,
-                        "root_cause": solution.root_cause,
-                        "machine_type": solution.machine_type,
-                        "success_rate": solution.success_rate,
-                        "verified": solution.verified,
-                        "created_at": solution.created_at.isoformat(),
-                    }
-            except ValueError:
-                logger.warning(f"Invalid solution ID: {solution_id}")
+            if solution:
+                return {
+                    "id": str(solution.id),
+                    "error_pattern": solution.error_pattern,
+                    "error_category": solution.error_category,
+                    "solution_summary": solution.solution_summary,
+                    "solution_text": solution.solution_text,
+                    "solution_steps": solution.solution_steps,
+                    "root_cause": solution.root_cause,
+                    "machine_type": solution.machine_type,
+                    "success_rate": solution.success_rate,
+                    "verified": solution.verified,
+                    "created_at": solution.created_at.isoformat(),
+                }
         
         return None
     
@@ -135,11 +365,16 @@ class SolutionService:
         Returns:
             True if feedback was recorded
         """
+        try:
+            uid = uuid.UUID(solution_id)
+        except ValueError:
+            logger.warning(f"Invalid solution ID: {solution_id}")
+            return False
+        
         async with get_async_session() as session:
             solution_repo = SolutionRepository(session)
             
             try:
-                uid = uuid.UUID(solution_id)
                 await solution_repo.update_success_count(uid, was_helpful)
                 await session.commit()
                 
@@ -188,21 +423,14 @@ class SolutionService:
                     source_thread_ts=kwargs.get("thread_ts"),
                     created_by=created_by,
                     machine_type=kwargs.get("machine_type"),
-                )
-                
-                # Add to vector store
-                self.vector_store.add_solution(
-                    solution_id=str(solution.id),
-                    error_pattern=error_pattern,
-                    solution_text=solution_text,
-                    metadata={
-                        "category": kwargs.get("category"),
-                        "machine_type": kwargs.get("machine_type"),
-                    },
+                    is_indexed=False,
                 )
                 
                 await session.commit()
                 
+                # Embedding happens in the background, batched with other writes
+                await self._get_index_queue().put(_index_item(solution))
+                
                 logger.info(
                     "Solution added",
                     solution_id=str(solution.id),
@@ -214,3 +442,22 @@ class SolutionService:
             except Exception as e:
                 logger.error(f"Failed to add solution: {e}")
                 return None
+
+
+def _index_item(solution) -> dict:
+    """Build a vector store queue item from a Solution row."""
+    return {
+        "solution_id": str(solution.id),
+        "error_pattern": solution.error_pattern,
+        "solution_text": solution.solution_text,
+        "metadata": {
+            "category": solution.error_category,
+            "machine_type": solution.machine_type,
+        },
+    }
+
+
+@lru_cache(maxsize=1)
+def get_solution_service() -> SolutionService:
+    """Get the shared SolutionService instance."""
+    return SolutionService()
@@ -0,0 +1,24 @@
+"""
+RecycleOps AI Assistant - Slack Clients
+
+Shared Slack API clients for code running inside async services.
+"""
+from functools import lru_cache
+
+from slack_sdk.web.async_client import AsyncWebClient
+
+from src.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_async_web_client() -> AsyncWebClient:
+    """
+    Get the shared async Slack Web API client.
+
+    Without an explicit aiohttp session the client opens one per request,
+    so the same instance is safe to use from any event loop.
+
+    Returns:
+        AsyncWebClient authenticated with the bot token
+    """
+    return AsyncWebClient(token=settings.slack_bot_token)
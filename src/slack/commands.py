@@ -11,15 +11,36 @@ from typing import Optional
 
 from slack_bolt import App, Ack, Respond
 from slack_sdk import WebClient
+from slack_sdk.web.async_client import AsyncWebClient
 import structlog
 
 from src.config import settings
-from src.services.solution_service import SolutionService
-from src.services.conversation_service import ConversationService
+from src.services.solution_service import get_solution_service
+from src.services.conversation_service import get_conversation_service
 
 
 logger = structlog.get_logger(__name__)
 
+# Static Slack blocks shared by every search response (read-only)
+_SEARCH_HEADER_BLOCK = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "🔎 Arama Sonuçları",
+        "emoji": True,
+    },
+}
+_DIVIDER_BLOCK = {"type": "divider"}
+_FEEDBACK_BLOCK = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": "💡 Çözüm işe yaradı mı? 👍 veya 👎 ile geri bildirim verin.",
+        },
+    ],
+}
+
 
 def handle_search_command(
     ack: Ack,
@@ -64,12 +85,12 @@ def handle_search_command(
     
     try:
         # Search for solutions
-        solution_service = SolutionService()
-        results = solution_service.search_solutions(
+        solution_service = get_solution_service()
+        results = asyncio.run(solution_service.search_solutions(
             query=query,
             max_results=settings.max_search_results,
             min_similarity=settings.similarity_threshold,
-        )
+        ))
         
         if not results:
             respond(
@@ -100,14 +121,7 @@ def handle_search_command(
 def format_search_results(query: str, results: list[dict]) -> list[dict]:
     """Format search results as Slack blocks."""
     blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": f"🔎 Arama Sonuçları",
-                "emoji": True,
-            },
-        },
+        _SEARCH_HEADER_BLOCK,
         {
             "type": "context",
             "elements": [
@@ -117,14 +131,14 @@ def format_search_results(query: str, results: list[dict]) -> list[dict]:
                 },
             ],
         },
-        {"type": "divider"},
+        _DIVIDER_BLOCK,
     ]
     
     for i, result in enumerate(results, 1):
         similarity_pct = int(result.get("similarity", 0) * 100)
         
         # Solution block
-        blocks.append({
+        section = {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
@@ -134,11 +148,12 @@ def format_search_results(query: str, results: list[dict]) -> list[dict]:
                     f"✅ *Çözüm:* {result.get('solution_summary', result.get('solution_text', 'N/A'))[:300]}"
                 ),
             },
-        })
+        }
         
         # Add source link if available
+        source = None
         if result.get("source_link"):
-            blocks.append({
+            source = {
                 "type": "context",
                 "elements": [
                     {
@@ -146,7 +161,7 @@ def format_search_results(query: str, results: list[dict]) -> list[dict]:
                         "text": f"📎 <{result['source_link']}|Kaynak konuşmaya git>",
                     },
                 ],
-            })
+            }
         
         # Add metadata
         metadata_parts = []
@@ -157,26 +172,19 @@ def format_search_results(query: str, results: list[dict]) -> list[dict]:
         if result.get("success_rate"):
             metadata_parts.append(f"✓ {int(result['success_rate'] * 100)}% başarı")
         
+        metadata = None
         if metadata_parts:
-            blocks.append({
+            metadata = {
                 "type": "context",
                 "elements": [
                     {"type": "mrkdwn", "text": " | ".join(metadata_parts)},
                 ],
-            })
+            }
         
-        blocks.append({"type": "divider"})
+        blocks.extend(filter(None, (section, source, metadata, _DIVIDER_BLOCK)))
     
     # Add feedback prompt
-    blocks.append({
-        "type": "context",
-        "elements": [
-            {
-                "type": "mrkdwn",
-                "text": "💡 Çözüm işe yaradı mı? 👍 veya 👎 ile geri bildirim verin.",
-            },
-        ],
-    })
+    blocks.append(_FEEDBACK_BLOCK)
     
     return blocks
 
@@ -254,7 +262,7 @@ def handle_cozum_ekle_command(
 
 
 async def handle_cozum_getir_thread(
-    client: WebClient,
+    client: AsyncWebClient,
     channel_id: str,
     thread_ts: str,
     user_id: str,
@@ -263,7 +271,7 @@ async def handle_cozum_getir_thread(
     Process /cozum-getir for a specific thread.
     
     Args:
-        client: Slack WebClient
+        client: Async Slack client
         channel_id: Channel ID
         thread_ts: Thread timestamp
         user_id: User who triggered the command
@@ -273,8 +281,7 @@ async def handle_cozum_getir_thread(
     """
     try:
         # Fetch thread messages
-        result = await asyncio.to_thread(
-            client.conversations_replies,
+        result = await client.conversations_replies(
             channel=channel_id,
             ts=thread_ts,
             limit=50,
@@ -288,13 +295,13 @@ async def handle_cozum_getir_thread(
             }
         
         # Combine messages into context
-        conversation_text = "\n".join([
+        conversation_text = "\n".join(
             f"{msg.get('user', 'Unknown')}: {msg.get('text', '')}"
             for msg in messages
-        ])
+        )
         
         # Search for similar solutions
-        solution_service = SolutionService()
+        solution_service = get_solution_service()
         results = await solution_service.search_solutions(
             query=conversation_text,
             max_results=3,
@@ -316,7 +323,7 @@ async def handle_cozum_getir_thread(
 
 
 async def handle_cozum_ekle_thread(
-    client: WebClient,
+    client: AsyncWebClient,
     channel_id: str,
     thread_ts: str,
     user_id: str,
@@ -328,8 +335,7 @@ async def handle_cozum_ekle_thread(
     """
     try:
         # Fetch thread messages
-        result = await asyncio.to_thread(
-            client.conversations_replies,
+        result = await client.conversations_replies(
             channel=channel_id,
             ts=thread_ts,
             limit=100,
@@ -344,7 +350,7 @@ async def handle_cozum_ekle_thread(
             }
         
         # Process the conversation
-        conversation_service = ConversationService()
+        conversation_service = get_conversation_service()
         solution = await conversation_service.analyze_and_save_solution(
             channel_id=channel_id,
             thread_ts=thread_ts,
@@ -4,21 +4,99 @@ RecycleOps AI Assistant - Slack Event Handlers
 Handlers for Slack events like messages, reactions, etc.
 """
 import asyncio
+import atexit
 import re
+import sys
+import threading
 from datetime import datetime
-from typing import Optional
+from typing import Any, Coroutine, Optional
 
 from slack_bolt import App
 from slack_sdk import WebClient
 import structlog
 
 from src.config import settings
-from src.services.proactive_service import ProactiveService
-from src.services.conversation_service import ConversationService
+from src.services.proactive_service import get_proactive_service
+from src.services.conversation_service import ConversationService, get_conversation_service
+from src.services.solution_service import SolutionService
+from src.slack.client import get_async_web_client
 
 
 logger = structlog.get_logger(__name__)
 
+# One long-lived event loop serves every handler, so async clients, the DB
+# pool and the write-behind queues survive between Slack events
+_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_LOOP.run_forever, name="slack-event-loop", daemon=True).start()
+
+# Upper bound for flushing queued writes when the process exits
+SHUTDOWN_FLUSH_TIMEOUT_SECONDS = 10
+
+
+def _run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result(timeout=timeout)
+
+
+async def _gather(*coros: Coroutine) -> list:
+    """Await coroutines concurrently, returning exceptions instead of raising."""
+    return await asyncio.gather(*coros, return_exceptions=True)
+
+
+def start_background_jobs() -> None:
+    """
+    Connect the database and start the scheduler on the shared loop.
+    
+    Scheduled jobs then share the database pool and the write-behind queues
+    with the event handlers. The scheduler is not started if the database
+    is unreachable, since every job needs it.
+    """
+    from src.database.connection import init_database
+    from src.learning.scheduler import start_scheduler
+    
+    try:
+        _run_async(init_database())
+    except Exception as e:
+        logger.error("Database unavailable, background jobs not started", error=str(e))
+        return
+    
+    start_scheduler(event_loop=_LOOP)
+
+
+@atexit.register
+def flush_pending_writes() -> None:
+    """
+    Write out tracked messages and solutions still queued on the shared loop.
+    
+    Runs at interpreter exit and from the SIGTERM handler in main; a
+    second call is a no-op.
+    """
+    # No reindex job may queue solutions behind the flush. The scheduler is
+    # only loaded once start_background_jobs ran, and importing it at exit fails.
+    scheduler = sys.modules.get("src.learning.scheduler")
+    if scheduler is not None:
+        try:
+            scheduler.stop_scheduler()
+        except Exception as e:
+            logger.error("Failed to stop scheduler", error=str(e))
+    
+    try:
+        results = _run_async(
+            _gather(
+                ConversationService.flush_tracked_messages(),
+                SolutionService.flush_indexed_solutions(),
+            ),
+            timeout=SHUTDOWN_FLUSH_TIMEOUT_SECONDS,
+        )
+    except Exception as e:
+        logger.error("Failed to flush pending writes", error=str(e))
+        return
+    
+    for queue_name, result in zip(("tracked messages", "indexed solutions"), results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to flush {queue_name}", error=str(result))
+
+
 # Patterns that indicate an error message
 ERROR_PATTERNS = [
     r"\[DESTEK\]",
@@ -33,46 +111,112 @@ ERROR_PATTERNS = [
     r"problem",
 ]
 
+# Event types with dedicated handlers; everything else goes to the catch-all
+HANDLED_EVENT_TYPES = frozenset({"message", "app_mention", "reaction_added"})
+_UNHANDLED_EVENT_TYPE_RE = re.compile(
+    "^(?!(?:" + "|".join(map(re.escape, sorted(HANDLED_EVENT_TYPES))) + ")$).+"
+)
+
+# Patterns that capture a location name
+LOCATION_PATTERNS = [
+    r"(\w+)\s+şubesi",
+    r"(\w+)\s+fabrikası",
+    r"(\w+)\s+tesisi",
+    r"lokasyon[:\s]+(\w+)",
+]
+
+# Error patterns merged into one compiled alternation
+_ERROR_RE = re.compile(
+    "|".join(f"(?:{p})" for p in ERROR_PATTERNS),
+    re.IGNORECASE,
+)
+
+# Machine types such as A1100 or B2200 (always upper case)
+MACHINE_PATTERN = r"\b[A-Z]\d{3,4}\b"
+
+_MACHINE_RE = re.compile(MACHINE_PATTERN)
+
+# Location, machine type and triggers in one alternation, so a message is
+# walked once. Location goes first because its name word may start with a
+# trigger ("arızalı tesisi"), and triggers are a lookahead so they never
+# consume a following location word. The machine alternative stays
+# case-sensitive.
+_SCAN_RE = re.compile(
+    "|".join((
+        "(?P<location>" + "|".join(f"(?:{p})" for p in LOCATION_PATTERNS) + ")",
+        f"(?-i:(?P<machine>{MACHINE_PATTERN}))",
+        "(?=(?P<trigger>" + "|".join(f"(?:{p})" for p in ERROR_PATTERNS) + "))",
+    )),
+    re.IGNORECASE,
+)
+# Each location pattern has one group, numbered right after "location"
+_LOCATION_GROUPS = tuple(
+    range(
+        _SCAN_RE.groupindex["location"] + 1,
+        _SCAN_RE.groupindex["location"] + 1 + len(LOCATION_PATTERNS),
+    )
+)
+
 
 def is_error_message(text: str) -> bool:
     """Check if a message appears to be an error report."""
     if not text:
         return False
     
-    text_lower = text.lower()
-    for pattern in ERROR_PATTERNS:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            return True
-    return False
+    return _ERROR_RE.search(text) is not None
 
 
-def extract_error_info(text: str) -> dict:
-    """Extract error information from message text."""
+def scan_message(text: str) -> tuple[bool, dict]:
+    """
+    Scan a message once for error triggers, machine type and location.
+    
+    Args:
+        text: Message text
+        
+    Returns:
+        Tuple of (is_error, error_info)
+    """
     info = {
         "machine_type": None,
         "error_type": None,
         "location": None,
     }
+    is_error = False
     
-    # Try to extract machine type (e.g., A1100, B2200, etc.)
-    machine_match = re.search(r"\b([A-Z]\d{3,4})\b", text)
-    if machine_match:
-        info["machine_type"] = machine_match.group(1)
-    
-    # Try to extract location
-    location_patterns = [
-        r"(\w+)\s+şubesi",
-        r"(\w+)\s+fabrikası",
-        r"(\w+)\s+tesisi",
-        r"lokasyon[:\s]+(\w+)",
-    ]
-    for pattern in location_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            info["location"] = match.group(1)
+    if not text:
+        return is_error, info
+    
+    for match in _SCAN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "trigger":
+            is_error = True
+        elif kind == "machine":
+            if info["machine_type"] is None:
+                info["machine_type"] = match.group("machine")
+        else:
+            if info["location"] is None:
+                info["location"] = next(
+                    name for name in map(match.group, _LOCATION_GROUPS) if name is not None
+                )
+            # A location match consumes its text, so look inside it for the rest
+            start, end = match.span()
+            if not is_error:
+                trigger_match = _ERROR_RE.search(text, start)
+                is_error = trigger_match is not None and trigger_match.start() < end
+            if info["machine_type"] is None:
+                machine_match = _MACHINE_RE.search(text, start, end)
+                if machine_match:
+                    info["machine_type"] = machine_match.group()
+        
+        if is_error and info["machine_type"] and info["location"]:
             break
     
-    return info
+    return is_error, info
+
+
+def extract_error_info(text: str) -> dict:
+    """Extract error information from message text."""
+    return scan_message(text)[1]
 
 
 def handle_message(
@@ -92,16 +236,17 @@ def handle_message(
     if event.get("bot_id"):
         return
     
+    # Skip if not in a monitored channel, before any other work
     channel_id = event.get("channel")
+    monitored = settings.monitor_channel_ids
+    if monitored and channel_id not in monitored:
+        return
+    
     user_id = event.get("user")
     text = event.get("text", "")
     ts = event.get("ts")
     thread_ts = event.get("thread_ts")  # None if not in a thread
     
-    # Skip if not in a monitored channel
-    if settings.monitor_channel_ids and channel_id not in settings.monitor_channel_ids:
-        return
-    
     logger.info(
         "Processing message",
         channel=channel_id,
@@ -109,38 +254,54 @@ def handle_message(
         is_thread=thread_ts is not None,
     )
     
+    # Tracking and proactive support are independent, so they run
+    # concurrently; each job carries the message logged if it fails
+    jobs: list[tuple[str, Coroutine]] = []
+    
     # Track conversation
     try:
-        conversation_service = ConversationService()
-        asyncio.run(conversation_service.track_message(
-            channel_id=channel_id,
-            thread_ts=thread_ts or ts,  # Use message ts as thread_ts for parent messages
-            message_ts=ts,
-            user_id=user_id,
-            text=text,
+        conversation_service = get_conversation_service()
+        jobs.append((
+            "Failed to track conversation",
+            conversation_service.track_message(
+                channel_id=channel_id,
+                thread_ts=thread_ts or ts,  # Use message ts as thread_ts for parent messages
+                message_ts=ts,
+                user_id=user_id,
+                text=text,
+            ),
         ))
     except Exception as e:
         logger.error("Failed to track conversation", error=str(e))
     
     # Check for error patterns (only for parent messages, not thread replies)
-    if not thread_ts and is_error_message(text):
+    is_error, error_info = scan_message(text) if not thread_ts else (False, None)
+    if is_error:
         logger.info("Detected potential error message", channel=channel_id, ts=ts)
         
-        # Extract error info
-        error_info = extract_error_info(text)
-        
         # Trigger proactive support
         if settings.proactive_support_enabled:
             try:
-                proactive_service = ProactiveService(client)
-                asyncio.run(proactive_service.suggest_solution(
-                    channel_id=channel_id,
-                    thread_ts=ts,
-                    error_text=text,
-                    error_info=error_info,
+                proactive_service = get_proactive_service(get_async_web_client())
+                jobs.append((
+                    "Failed to provide proactive support",
+                    proactive_service.suggest_solution(
+                        channel_id=channel_id,
+                        thread_ts=ts,
+                        error_text=text,
+                        error_info=error_info,
+                    ),
                 ))
             except Exception as e:
                 logger.error("Failed to provide proactive support", error=str(e))
+    
+    if not jobs:
+        return
+    
+    results = _run_async(_gather(*(coro for _, coro in jobs)))
+    for (error_message, _), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            logger.error(error_message, error=str(result))
 
 
 def handle_app_mention(
@@ -180,8 +341,8 @@ def handle_app_mention(
     
     # Search for solutions
     try:
-        proactive_service = ProactiveService(client)
-        asyncio.run(proactive_service.respond_to_mention(
+        proactive_service = get_proactive_service(get_async_web_client())
+        _run_async(proactive_service.respond_to_mention(
             channel_id=channel_id,
             thread_ts=thread_ts,
             user_id=user_id,
@@ -256,11 +417,9 @@ def register_event_handlers(app: App) -> None:
     def reaction_added_handler(event, client, logger):
         handle_reaction_added(event, client, logger)
     
-    # Log unhandled events for debugging
-    @app.event({"type": re.compile(".*")})
+    # Log unhandled events for debugging; handled types never reach it
+    @app.event({"type": _UNHANDLED_EVENT_TYPE_RE})
     def catch_all_handler(event, logger):
-        event_type = event.get("type", "unknown")
-        if event_type not in ["message", "app_mention", "reaction_added"]:
-            logger.debug("Unhandled event type", event_type=event_type)
+        logger.debug("Unhandled event type", event_type=event.get("type", "unknown"))
     
     logger.info("Slack event handlers registered")
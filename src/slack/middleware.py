@@ -13,6 +13,32 @@ import structlog
 logger = structlog.get_logger(__name__)
 
 
+def _event_request_info(body: dict) -> tuple:
+    """Read (event_type, user_id, channel_id) from an Events API body."""
+    event = body["event"]
+    return (
+        event.get("type", body.get("type", "unknown")),
+        event.get("user"),
+        event.get("channel"),
+    )
+
+
+def _command_request_info(body: dict) -> tuple:
+    """Read (event_type, user_id, channel_id) from a slash command body."""
+    return (
+        f"command:{body.get('command', 'unknown')}",
+        body.get("user_id"),
+        body.get("channel_id"),
+    )
+
+
+# Body key identifying the request kind -> extractor for its log fields
+_REQUEST_INFO_EXTRACTORS = {
+    "event": _event_request_info,
+    "command": _command_request_info,
+}
+
+
 def log_request_middleware(
     req: BoltRequest,
     resp: BoltResponse,
@@ -23,19 +49,13 @@ def log_request_middleware(
     """
     # Extract relevant info for logging - use body instead of payload
     body = req.body or {}
-    event_type = body.get("type", "unknown")
-    user_id = None
-    channel_id = None
     
-    if "event" in body:
-        event = body["event"]
-        event_type = event.get("type", event_type)
-        user_id = event.get("user")
-        channel_id = event.get("channel")
-    elif "command" in body:
-        event_type = f"command:{body.get('command', 'unknown')}"
-        user_id = body.get("user_id")
-        channel_id = body.get("channel_id")
+    for key, extract in _REQUEST_INFO_EXTRACTORS.items():
+        if key in body:
+            event_type, user_id, channel_id = extract(body)
+            break
+    else:
+        event_type, user_id, channel_id = body.get("type", "unknown"), None, None
     
     logger.info(
         "Incoming Slack request",
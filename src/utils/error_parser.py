@@ -4,22 +4,25 @@ RecycleOps AI Assistant - Error Parser
 Utilities for parsing and categorizing error messages.
 """
 import re
+from itertools import islice
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass
+# Words of 4+ characters considered for keywords, minus common filler words
+_MIN_WORD_LENGTH = 4
+_WORD_RE = re.compile(rf"\b\w{{{_MIN_WORD_LENGTH},}}\b")
+_COMMON_WORDS = frozenset({"olan", "için", "gibi", "daha", "nasıl", "neden", "sonra", "önce"})
+
+
+@dataclass(slots=True)
 class ParsedError:
     """Parsed error information."""
     machine_type: Optional[str] = None
     error_type: Optional[str] = None
     location: Optional[str] = None
     severity: Optional[str] = None
-    keywords: list[str] = None
-    
-    def __post_init__(self):
-        if self.keywords is None:
-            self.keywords = []
+    keywords: list[str] = field(default_factory=list)
 
 
 class ErrorParser:
@@ -31,18 +34,18 @@ class ErrorParser:
     """
     
     # Machine type patterns
-    MACHINE_PATTERNS = [
+    MACHINE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
         r"\b([A-Z]{1,3}\d{3,4})\b",  # A1100, BC2200
         r"(?:makine|machine)\s*(?:no|#|numarası)?\s*[:\s]?\s*([A-Z0-9-]+)",
         r"(?:hat|line)\s*[:\s]?\s*(\d+)",
-    ]
+    ))
     
     # Location patterns
-    LOCATION_PATTERNS = [
+    LOCATION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
         r"(\w+)\s+(?:şubesi|fabrikası|tesisi|lokasyonu)",
         r"(?:lokasyon|location|yer)[:\s]+(\w+)",
         r"@\s*(\w+)\s+(?:factory|plant|site)",
-    ]
+    ))
     
     # Severity indicators
     SEVERITY_KEYWORDS = {
@@ -65,6 +68,35 @@ class ErrorParser:
         "maintenance": ["bakım", "maintenance", "yağlama", "temizlik"],
     }
     
+    def __init__(self):
+        # Keyword -> label lookups; the first label listed for a keyword wins
+        self._severity_of: dict[str, str] = {}
+        for severity, keywords in self.SEVERITY_KEYWORDS.items():
+            for keyword in keywords:
+                self._severity_of.setdefault(keyword, severity)
+        
+        self._error_type_of: dict[str, str] = {}
+        for error_type, keywords in self.ERROR_TYPES.items():
+            for keyword in keywords:
+                self._error_type_of.setdefault(keyword, error_type)
+        
+        # One scanner for every keyword. The lookahead lets occurrences
+        # overlap, and longer keywords are tried first at each position.
+        all_keywords = sorted(
+            self._severity_of.keys() | self._error_type_of.keys(),
+            key=len,
+            reverse=True,
+        )
+        self._keyword_re = re.compile(
+            "(?=(" + "|".join(re.escape(k) for k in all_keywords) + "))"
+        )
+        
+        # A keyword inside a longer matched keyword is present as well
+        self._contained_keywords: dict[str, tuple[str, ...]] = {
+            keyword: tuple(k for k in all_keywords if k != keyword and k in keyword)
+            for keyword in all_keywords
+        }
+    
     def parse(self, text: str) -> ParsedError:
         """
         Parse an error message and extract structured information.
@@ -78,18 +110,29 @@ class ErrorParser:
         if not text:
             return ParsedError()
         
+        text_lower = text.lower()
+        matched = self._match_keywords(text_lower)
+        machine = self._extract_machine_type(text)
+        
         return ParsedError(
-            machine_type=self._extract_machine_type(text),
-            error_type=self._detect_error_type(text),
+            machine_type=machine,
+            error_type=self._detect_error_type(matched),
             location=self._extract_location(text),
-            severity=self._detect_severity(text),
-            keywords=self._extract_keywords(text),
+            severity=self._detect_severity(matched),
+            keywords=self._extract_keywords(text_lower, matched, machine),
         )
     
+    def _match_keywords(self, text_lower: str) -> set[str]:
+        """Find every severity and error type keyword in one pass."""
+        matched = {m.group(1) for m in self._keyword_re.finditer(text_lower)}
+        for keyword in tuple(matched):
+            matched.update(self._contained_keywords[keyword])
+        return matched
+    
     def _extract_machine_type(self, text: str) -> Optional[str]:
         """Extract machine type from text."""
         for pattern in self.MACHINE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 return match.group(1).upper()
         return None
@@ -97,57 +140,54 @@ class ErrorParser:
     def _extract_location(self, text: str) -> Optional[str]:
         """Extract location from text."""
         for pattern in self.LOCATION_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return None
     
-    def _detect_severity(self, text: str) -> str:
-        """Detect severity level from text."""
-        text_lower = text.lower()
+    def _detect_severity(self, matched: set[str]) -> str:
+        """Pick the highest severity among the matched keywords."""
+        severities = {self._severity_of[k] for k in matched if k in self._severity_of}
         
-        for severity, keywords in self.SEVERITY_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return severity
+        for severity in self.SEVERITY_KEYWORDS:
+            if severity in severities:
+                return severity
         
         return "medium"  # Default severity
     
-    def _detect_error_type(self, text: str) -> Optional[str]:
-        """Detect error type from text."""
-        text_lower = text.lower()
+    def _detect_error_type(self, matched: set[str]) -> Optional[str]:
+        """Pick the first listed error type among the matched keywords."""
+        error_types = {self._error_type_of[k] for k in matched if k in self._error_type_of}
         
-        for error_type, keywords in self.ERROR_TYPES.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return error_type
+        for error_type in self.ERROR_TYPES:
+            if error_type in error_types:
+                return error_type
         
         return None
     
-    def _extract_keywords(self, text: str) -> list[str]:
+    def _extract_keywords(
+        self,
+        text_lower: str,
+        matched: set[str],
+        machine: Optional[str],
+    ) -> list[str]:
         """Extract relevant keywords from text."""
-        keywords = set()
-        text_lower = text.lower()
-        
         # Add matched error type keywords
-        for error_type, type_keywords in self.ERROR_TYPES.items():
-            for keyword in type_keywords:
-                if keyword in text_lower:
-                    keywords.add(keyword)
+        keywords = {k for k in matched if k in self._error_type_of}
         
         # Add machine type
-        machine = self._extract_machine_type(text)
         if machine:
             keywords.add(machine.lower())
         
+        # Text too short to hold a significant word needs no word scan
+        if len(text_lower) < _MIN_WORD_LENGTH:
+            return list(keywords)
+        
         # Extract significant words (4+ characters, not common words)
-        common_words = {"olan", "için", "gibi", "daha", "nasıl", "neden", "sonra", "önce"}
-        words = re.findall(r"\b\w{4,}\b", text_lower)
-        for word in words[:10]:
-            if word not in common_words:
-                keywords.add(word)
+        words = _WORD_RE.findall(text_lower)
+        keywords.update(frozenset(words[:10]) - _COMMON_WORDS)
         
-        return list(keywords)[:15]
+        return list(islice(keywords, 15))
 
 
 # Singleton instance
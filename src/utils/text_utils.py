@@ -4,9 +4,118 @@ RecycleOps AI Assistant - Text Utilities
 Text preprocessing and formatting utilities.
 """
 import re
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Optional
 
+try:
+    # Linear-time matching on untrusted Slack text (pip install .[re2])
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
 
+
+# Slack markup patterns, compiled once at import
+_RE_USER = _re_engine.compile(r"<@[A-Z0-9]+>")
+_RE_CHANNEL = _re_engine.compile(r"<#[A-Z0-9]+\|?[^>]*>")
+_RE_URL = _re_engine.compile(r"<(https?://[^>]+)>")
+_RE_EMOJI = _re_engine.compile(r":([a-z0-9_+-]+):")
+# Stays on stdlib re: RE2's \s only covers ASCII whitespace
+_RE_WS = re.compile(r"\s+")
+
+# All Slack markup in one alternation, so cleaning is a single pass
+_RE_SLACK = _re_engine.compile(
+    "|".join(
+        f"(?P<{name}>{pattern.pattern})"
+        for name, pattern in (
+            ("user", _RE_USER),
+            ("channel", _RE_CHANNEL),
+            ("url", _RE_URL),
+            ("emoji", _RE_EMOJI),
+        )
+    )
+)
+
+# Code block patterns
+_CODE_FENCE = "```"
+# Stays on stdlib re: RE2's \w only covers ASCII word characters
+_RE_CODE_LANG = re.compile(r"\w+\n")
+_RE_SINGLE = _re_engine.compile(r"`([^`]+)`")
+
+
+# Turkish characters and their ASCII equivalents
+_TURKISH_TO_ASCII = {
+    "ı": "i", "İ": "I",
+    "ğ": "g", "Ğ": "G",
+    "ü": "u", "Ü": "U",
+    "ş": "s", "Ş": "S",
+    "ö": "o", "Ö": "O",
+    "ç": "c", "Ç": "C",
+}
+
+# Translation table indexed by code point, up to the highest Turkish
+# character; str.translate leaves code points past the end unchanged
+_TR_TABLE = tuple(
+    ord(_TURKISH_TO_ASCII.get(chr(codepoint), chr(codepoint)))
+    for codepoint in range(ord(max(_TURKISH_TO_ASCII)) + 1)
+)
+
+
+# Different bold pattern sets mostly reuse the same terms
+_escape = lru_cache(maxsize=1024)(re.escape)
+
+
+@lru_cache(maxsize=256)
+def _bold_res(patterns: tuple[str, ...]) -> tuple[re.Pattern, ...]:
+    """Compile each bold pattern once, case-insensitively, in list order."""
+    return tuple(re.compile(_escape(p), re.IGNORECASE) for p in dict.fromkeys(patterns))
+
+
+def _bold(text: str, patterns: tuple[str, ...]) -> str:
+    """
+    Wrap pattern matches in asterisks in a single rebuild of the text.
+    
+    Earlier patterns take precedence: a match overlapping one claimed by an
+    earlier pattern is skipped. Applying each pattern in turn used to wrap
+    such overlaps again ("**moto*r*" for ["motor", "moto"]); now every
+    character is wrapped at most once.
+    """
+    # Claimed spans, kept sorted and non-overlapping
+    starts: list[int] = []
+    ends: list[int] = []
+    for pattern_re in _bold_res(patterns):
+        for match in pattern_re.finditer(text):
+            start, end = match.span()
+            i = bisect_right(starts, start)
+            if (i and ends[i - 1] > start) or (i < len(starts) and starts[i] < end):
+                continue
+            starts.insert(i, start)
+            ends.insert(i, end)
+    
+    parts = []
+    pos = 0
+    for start, end in zip(starts, ends):
+        parts += (text[pos:start], "*", text[start:end], "*")
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _replace_slack_markup(match: re.Match) -> str:
+    """Replacement for one _RE_SLACK match."""
+    kind = match.lastgroup
+    if kind == "url":
+        url_parts = match.group("url")[1:-1].split("|")
+        if len(url_parts) > 1:
+            # Return label, with any emoji codes in it unwrapped
+            return _RE_EMOJI.sub(r"\1", url_parts[1])
+        return "[link]"
+    if kind == "emoji":
+        return match.group("emoji")[1:-1]
+    return ""
+
+
+@lru_cache(maxsize=2048)
 def clean_slack_text(text: str) -> str:
     """
     Clean Slack-specific formatting from text.
@@ -26,26 +135,13 @@ def clean_slack_text(text: str) -> str:
     if not text:
         return ""
     
-    # Remove user mentions
-    text = re.sub(r"<@[A-Z0-9]+>", "", text)
-    
-    # Remove channel mentions
-    text = re.sub(r"<#[A-Z0-9]+\|?[^>]*>", "", text)
-    
-    # Replace URLs with their labels or domain
-    def replace_url(match):
-        url_parts = match.group(1).split("|")
-        if len(url_parts) > 1:
-            return url_parts[1]  # Return label
-        return "[link]"
-    
-    text = re.sub(r"<(https?://[^>]+)>", replace_url, text)
-    
-    # Remove emoji codes (keep the text readable)
-    text = re.sub(r":([a-z0-9_+-]+):", r"\1", text)
+    # Every markup pattern needs "<" or ":", so plain text skips the scan
+    if "<" in text or ":" in text:
+        # Mentions are dropped, URLs become their label, emoji codes their name
+        text = _RE_SLACK.sub(_replace_slack_markup, text)
     
     # Clean up extra whitespace
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _RE_WS.sub(" ", text).strip()
     
     return text
 
@@ -78,13 +174,27 @@ def extract_code_blocks(text: str) -> list[str]:
     Returns:
         List of code block contents
     """
-    # Match triple backtick code blocks
-    triple_pattern = r"```(?:\w+\n)?(.*?)```"
-    triple_matches = re.findall(triple_pattern, text, re.DOTALL)
-    
-    # Match single backtick inline code
-    single_pattern = r"`([^`]+)`"
-    single_matches = re.findall(single_pattern, text)
+    triple_matches = []
+    single_matches = []
+    
+    # Walk fence to fence; inline code is only searched between blocks
+    pos = 0
+    while True:
+        start = text.find(_CODE_FENCE, pos)
+        end = text.find(_CODE_FENCE, start + 3) if start >= 0 else -1
+        if end < 0:
+            single_matches.extend(_RE_SINGLE.findall(text, pos))
+            break
+        
+        single_matches.extend(_RE_SINGLE.findall(text, pos, start))
+        
+        # Drop an optional language tag line
+        body_start = start + 3
+        lang = _RE_CODE_LANG.match(text, body_start, end)
+        if lang:
+            body_start = lang.end()
+        triple_matches.append(text[body_start:end])
+        pos = end + 3
     
     return triple_matches + single_matches
 
@@ -106,19 +216,14 @@ def format_slack_message(
     if not text:
         return ""
     
-    # Apply bold to patterns
+    # Apply bold to all patterns, earlier patterns first
     if bold_patterns:
-        for pattern in bold_patterns:
-            text = re.sub(
-                f"({re.escape(pattern)})",
-                r"*\1*",
-                text,
-                flags=re.IGNORECASE,
-            )
+        text = _bold(text, tuple(bold_patterns))
     
     return text
 
 
+@lru_cache(maxsize=2048)
 def normalize_turkish(text: str) -> str:
     """
     Normalize Turkish characters for search.
@@ -135,16 +240,7 @@ def normalize_turkish(text: str) -> str:
     if not text:
         return ""
     
-    replacements = {
-        "ı": "i", "İ": "I",
-        "ğ": "g", "Ğ": "G",
-        "ü": "u", "Ü": "U",
-        "ş": "s", "Ş": "S",
-        "ö": "o", "Ö": "O",
-        "ç": "c", "Ç": "C",
-    }
+    if text.isascii():
+        return text
     
-    for turkish, ascii_char in replacements.items():
-        text = text.replace(turkish, ascii_char)
-    
-    return text
+    return text.translate(_TR_TABLE)
@@ -1,14 +1,34 @@
 """
 RecycleOps AI Assistant - Test Configuration
 """
+import sys
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 
+from slack_sdk.web.async_client import AsyncWebClient
 
-@pytest.fixture
-def mock_slack_client():
-    """Mock Slack WebClient."""
-    client = MagicMock()
+from src.utils.text_utils import clean_slack_text, normalize_turkish
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Keep memoized helpers from leaking results between tests."""
+    yield
+    clean_slack_text.cache_clear()
+    normalize_turkish.cache_clear()
+    
+    # Only touch the generator if a test imported it; importing it here
+    # would require Slack/Google settings for every test module
+    generator = sys.modules.get("src.rag.generator")
+    if generator is not None:
+        generator._analysis_cache.clear()
+
+
+@pytest.fixture(scope="session")
+def _slack_client_template():
+    """Async Slack client mock, built once per session."""
+    client = MagicMock(spec=AsyncWebClient)
     client.chat_postMessage = AsyncMock()
     client.conversations_replies = AsyncMock()
     client.users_info = AsyncMock()
@@ -16,6 +36,13 @@ def mock_slack_client():
 
 
 @pytest.fixture
+def mock_slack_client(_slack_client_template):
+    """Mock Slack AsyncWebClient, reset for each test."""
+    _slack_client_template.reset_mock(return_value=True, side_effect=True)
+    return _slack_client_template
+
+
+@pytest.fixture(scope="module")
 def mock_settings():
     """Mock application settings."""
     settings = MagicMock()
@@ -32,7 +59,7 @@ def mock_settings():
     return settings
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_conversation():
     """Sample Slack conversation for testing."""
     return {
@@ -68,7 +95,7 @@ def sample_conversation():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_solution():
     """Sample solution for testing."""
     return {
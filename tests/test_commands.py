@@ -40,8 +40,8 @@ class TestSearchCommand:
         client = MagicMock()
         
         # Mock the solution service
-        with patch('src.slack.commands.SolutionService') as MockService:
-            mock_service = MockService.return_value
+        with patch('src.slack.commands.get_solution_service') as mock_get_service:
+            mock_service = mock_get_service.return_value
             mock_service.search_solutions = AsyncMock(return_value=[])
             
             await handle_search_command(ack, respond, command, client)
@@ -0,0 +1,84 @@
+"""
+Tests for the conversation tracking write-behind queue.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from src.services import conversation_service
+from src.services.conversation_service import ConversationService
+
+
+class TestTrackQueue:
+    """Tests for ConversationService's batched tracking writes."""
+
+    @pytest.fixture
+    def writes(self, monkeypatch):
+        """Record batches instead of writing them to the database."""
+        writes = []
+
+        async def fake_write(batch):
+            writes.append(list(batch))
+
+        monkeypatch.setattr(ConversationService, "_write_tracked_batch", staticmethod(fake_write))
+        yield writes
+        ConversationService._track_queues.clear()
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_queued_messages(self, writes):
+        """Test that flushing writes messages still waiting in the queue."""
+        queue = ConversationService._get_track_queue()
+        queue.put_nowait({"thread_ts": "1"})
+        queue.put_nowait({"thread_ts": "2"})
+
+        await ConversationService.flush_tracked_messages()
+
+        assert [m["thread_ts"] for batch in writes for m in batch] == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_flush_during_write_writes_once(self, writes, monkeypatch):
+        """Test that a flush landing mid-write does not write the batch again."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_write(batch):
+            writes.append(list(batch))
+            started.set()
+            await release.wait()
+
+        monkeypatch.setattr(ConversationService, "_write_tracked_batch", staticmethod(slow_write))
+
+        queue = ConversationService._get_track_queue()
+        queue.put_nowait({"thread_ts": "1"})
+        await asyncio.wait_for(started.wait(), timeout=5)
+
+        flush = asyncio.create_task(ConversationService.flush_tracked_messages())
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.wait_for(flush, timeout=5)
+
+        assert writes == [[{"thread_ts": "1"}]]
+
+    @pytest.mark.asyncio
+    async def test_queues_are_kept_per_loop(self, writes, monkeypatch):
+        """Test that another loop's queue is flushed on that loop, not replaced."""
+        monkeypatch.setattr(conversation_service, "TRACK_BATCH_MAX_WAIT_SECONDS", 60)
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever, daemon=True)
+        thread.start()
+
+        async def enqueue(thread_ts):
+            await ConversationService._get_track_queue().put({"thread_ts": thread_ts})
+
+        try:
+            asyncio.run_coroutine_threadsafe(enqueue("1"), other).result(timeout=5)
+            await enqueue("2")
+            await ConversationService.flush_tracked_messages()
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join(timeout=5)
+            other.close()
+
+        assert sorted(m["thread_ts"] for batch in writes for m in batch) == ["1", "2"]
+        assert ConversationService._track_queues == {}
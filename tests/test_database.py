@@ -0,0 +1,117 @@
+"""
+Tests for the database repositories.
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import SeverityLevel
+from src.database.repositories import ConversationRepository
+
+
+def _message(channel_id, thread_ts, hour, is_error=False, pattern=None, severity=None):
+    """Build a tracked message as queued by ConversationService."""
+    return {
+        "channel_id": channel_id,
+        "thread_ts": thread_ts,
+        "message_ts": datetime(2024, 1, 1, hour),
+        "is_error_thread": is_error,
+        "detected_error_pattern": pattern,
+        "severity": severity,
+    }
+
+
+def _inserted_rows(session) -> list[dict]:
+    """Extract the per-row insert values from the executed upsert."""
+    stmt = session.execute.call_args.args[0]
+    params = stmt.compile(dialect=postgresql.dialect()).params
+
+    rows = {}
+    for key, value in params.items():
+        column, _, index = key.rpartition("_m")
+        if column and index.isdigit():
+            rows.setdefault(int(index), {})[column] = value
+    return [rows[i] for i in sorted(rows)]
+
+
+class TestConversationRepository:
+    """Tests for ConversationRepository.bulk_upsert."""
+
+    @pytest.fixture
+    def session(self):
+        """Create a mock async session."""
+        return AsyncMock()
+
+    @pytest.fixture
+    def repo(self, session):
+        """Create a repository on the mock session."""
+        return ConversationRepository(session)
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_empty(self, repo, session):
+        """Test that an empty batch issues no statement."""
+        written = await repo.bulk_upsert([])
+
+        assert written == 0
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_single_statement(self, repo, session):
+        """Test that distinct threads are written in one statement."""
+        written = await repo.bulk_upsert([
+            _message("C1", "1.0", 10),
+            _message("C2", "2.0", 11),
+        ])
+
+        assert written == 2
+        session.execute.assert_called_once()
+        rows = _inserted_rows(session)
+        assert [(r["channel_id"], r["thread_ts"]) for r in rows] == [
+            ("C1", "1.0"),
+            ("C2", "2.0"),
+        ]
+        assert all(r["message_count"] == 1 for r in rows)
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_merges_same_thread(self, repo, session):
+        """Test that messages for one thread are merged into one row."""
+        written = await repo.bulk_upsert([
+            _message("C1", "1.0", 10),
+            _message("C1", "1.0", 12, is_error=True, pattern="A1100 sıkışma",
+                     severity=SeverityLevel.HIGH),
+            _message("C1", "1.0", 9),
+        ])
+
+        assert written == 1
+        [row] = _inserted_rows(session)
+        assert row["message_count"] == 3
+        assert row["first_message_ts"] == datetime(2024, 1, 1, 9)
+        assert row["last_message_ts"] == datetime(2024, 1, 1, 12)
+        assert row["process_after"] == datetime(2024, 1, 1, 12) + timedelta(hours=12)
+        assert row["is_error_thread"] is True
+        assert row["detected_error_pattern"] == "A1100 sıkışma"
+        assert row["severity"] == SeverityLevel.HIGH
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_keeps_last_pattern(self, repo, session):
+        """Test that later messages without a pattern keep the earlier one."""
+        await repo.bulk_upsert([
+            _message("C1", "1.0", 10, is_error=True, pattern="A1100"),
+            _message("C1", "1.0", 11),
+        ])
+
+        [row] = _inserted_rows(session)
+        assert row["is_error_thread"] is True
+        assert row["detected_error_pattern"] == "A1100"
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_conflicts_on_thread(self, repo, session):
+        """Test that the upsert targets the channel/thread unique key."""
+        await repo.bulk_upsert([_message("C1", "1.0", 10)])
+
+        stmt = session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (channel_id, thread_ts) DO UPDATE" in sql
+        assert "message_count = (conversations.message_count + excluded.message_count)" in sql
@@ -0,0 +1,120 @@
+"""
+Tests for Slack message scanning.
+"""
+import re
+
+import pytest
+
+from src.database.models import SeverityLevel
+from src.services.conversation_service import ConversationService
+from src.slack.events import (
+    ERROR_PATTERNS,
+    LOCATION_PATTERNS,
+    extract_error_info,
+    is_error_message,
+    scan_message,
+)
+
+
+SAMPLE_MESSAGES = [
+    "",
+    "Günaydın, vardiya devri tamam",
+    "[HATA] B2200 Ankara fabrikası üretim durdu",
+    "[ARIZA] lokasyon: Gebze, makine C330 çalışmıyor",
+    "acil! A1100 konveyör problem",
+    "Önemli: sensör hatası, İzmir şubesi",
+    "arızalı tesisi kontrol edin",
+    "a1100 ve X12345 kodları makine tipi değil",
+    "Bursa tesisi sıkışma var, A1100 ve B2200 etkilendi",
+    "[error] lowercase tag with D4040",
+    "Sorun yok, sadece bilgi: Konya şubesi E5050",
+]
+
+
+def _legacy_scan(text: str) -> tuple[bool, dict]:
+    """Detect errors and extract info with one search per pattern."""
+    is_error = any(re.search(p, text, re.IGNORECASE) for p in ERROR_PATTERNS)
+    info = {"machine_type": None, "error_type": None, "location": None}
+    if not is_error:
+        return is_error, info
+
+    machine_match = re.search(r"\b([A-Z]\d{3,4})\b", text)
+    if machine_match:
+        info["machine_type"] = machine_match.group(1)
+
+    location_matches = [
+        m for m in (re.search(p, text, re.IGNORECASE) for p in LOCATION_PATTERNS) if m
+    ]
+    if location_matches:
+        info["location"] = min(location_matches, key=lambda m: m.start()).group(1)
+
+    return is_error, info
+
+
+def _legacy_severity(text: str) -> SeverityLevel | None:
+    """Severity heuristic applied to the legacy error detection."""
+    if not _legacy_scan(text)[0]:
+        return None
+    text_lower = text.lower()
+    if any(w in text_lower for w in ["acil", "kritik", "durdu", "üretim"]):
+        return SeverityLevel.CRITICAL
+    if any(w in text_lower for w in ["önemli", "hata"]):
+        return SeverityLevel.HIGH
+    return SeverityLevel.MEDIUM
+
+
+@pytest.fixture(scope="module")
+def messages(sample_conversation):
+    """Sample conversation messages plus hand-picked edge cases."""
+    return [m["text"] for m in sample_conversation["messages"]] + SAMPLE_MESSAGES
+
+
+class TestScanMessage:
+    """Tests that scan_message matches the separate per-pattern checks."""
+
+    def test_error_detection_matches(self, messages):
+        """Test that error detection agrees with is_error_message."""
+        for text in messages:
+            assert scan_message(text)[0] == is_error_message(text), text
+            assert scan_message(text)[0] == _legacy_scan(text)[0], text
+
+    def test_error_info_matches(self, messages):
+        """Test that extracted info agrees on error messages."""
+        for text in messages:
+            is_error, info = scan_message(text)
+            if is_error:
+                assert info == _legacy_scan(text)[1], text
+                assert extract_error_info(text) == info, text
+
+    def test_trigger_inside_location(self):
+        """Test that a trigger consumed by a location match is still found."""
+        assert scan_message("arızalı tesisi kontrol edin") == (
+            True,
+            {"machine_type": None, "error_type": None, "location": "arızalı"},
+        )
+
+    @pytest.mark.asyncio
+    async def test_tracked_severity_and_pattern_match(self, messages, monkeypatch):
+        """Test that tracked messages get the same severity and pattern."""
+        writes = []
+
+        async def fake_write(batch):
+            writes.extend(batch)
+
+        monkeypatch.setattr(ConversationService, "_write_tracked_batch", staticmethod(fake_write))
+        service = ConversationService.__new__(ConversationService)
+        try:
+            for i, text in enumerate(messages):
+                await service.track_message("C1", str(i), "1234567890.123456", "U1", text)
+            await ConversationService.flush_tracked_messages()
+        finally:
+            ConversationService._track_queues.clear()
+
+        by_thread = {w["thread_ts"]: w for w in writes}
+        assert len(by_thread) == len(messages)
+        for i, text in enumerate(messages):
+            is_error, info = _legacy_scan(text)
+            tracked = by_thread[str(i)]
+            assert tracked["is_error_thread"] == is_error, text
+            assert tracked["severity"] == _legacy_severity(text), text
+            assert tracked["detected_error_pattern"] == info["error_type"], text
@@ -0,0 +1,83 @@
+"""
+Tests for the expert service caches.
+"""
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services import expert_service
+from src.services.expert_service import ExpertService
+
+
+def _expert(slack_user_id: str) -> MagicMock:
+    """Build an expert row."""
+    return MagicMock(
+        slack_user_id=slack_user_id,
+        display_name="Ayşe",
+        expertise_areas=["konveyör"],
+        machine_types=["A1100"],
+        solution_count=3,
+        response_count=5,
+        avg_response_time_minutes=12.0,
+        is_available=True,
+        last_active_at=None,
+    )
+
+
+class TestExpertCaches:
+    """Tests for ExpertService's lookup caches."""
+
+    @pytest.fixture
+    def repo(self, monkeypatch):
+        """Replace the database session and repository with mocks."""
+        repo = MagicMock()
+        repo.find_ranked = AsyncMock(return_value=[_expert("U1")])
+        repo.create_or_update = AsyncMock(return_value=_expert("U1"))
+        repo.update_profile_bulk = AsyncMock()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield AsyncMock()
+
+        monkeypatch.setattr(expert_service, "get_async_session", fake_session)
+        monkeypatch.setattr(expert_service, "ExpertRepository", lambda session: repo)
+        yield repo
+        expert_service._find_experts_cache.clear()
+        expert_service._profile_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_find_experts_returns_copies(self, repo):
+        """Test that mutating a result does not change the cached lookup."""
+        service = ExpertService()
+
+        first = await service.find_experts("A1100 konveyör sıkışması")
+        first[0]["machine_types"].append("B2200")
+        first.clear()
+        second = await service.find_experts("A1100 konveyör sıkışması")
+
+        assert repo.find_ranked.await_count == 1
+        assert second[0]["machine_types"] == ["A1100"]
+
+    @pytest.mark.asyncio
+    async def test_get_expert_profile_returns_copies(self, repo):
+        """Test that mutating a profile does not change the cached profile."""
+        service = ExpertService()
+
+        first = await service.get_expert_profile("U1")
+        first["expertise_areas"].append("sensör")
+        second = await service.get_expert_profile("U1")
+
+        assert repo.create_or_update.await_count == 1
+        assert second["expertise_areas"] == ["konveyör"]
+
+    @pytest.mark.asyncio
+    async def test_update_clears_find_experts_cache(self, repo):
+        """Test that a newly credited expert shows up in the next lookup."""
+        service = ExpertService()
+        await service.find_experts("A1100 konveyör sıkışması")
+
+        await service.update_expert_from_solution("U2", category="konveyör", machine_type="A1100")
+        await service.find_experts("A1100 konveyör sıkışması")
+
+        assert repo.find_ranked.await_count == 2
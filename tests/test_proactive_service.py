@@ -0,0 +1,58 @@
+"""
+Tests for the proactive support service.
+"""
+import asyncio
+import gc
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.proactive_service import ProactiveService
+
+
+class TestProactiveService:
+    """Tests for the ProactiveService class."""
+
+    @pytest.fixture
+    def service(self, mock_slack_client):
+        """Create a service with mocked solution and expert lookups."""
+        service = ProactiveService.__new__(ProactiveService)
+        service.slack_client = mock_slack_client
+        service.solution_service = MagicMock()
+        service.expert_service = MagicMock()
+        service.rag_chain = MagicMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_failed_expert_lookup_is_retrieved(self, service):
+        """Test that a discarded expert lookup failing on cancel is not reported as unhandled."""
+        service.solution_service.search_solutions = AsyncMock(return_value=[{
+            "id": "test-id-1",
+            "similarity": 0.9,
+            "error_pattern": "A1100 şişe sıkışması",
+            "solution_summary": "Konveyör hızını düşürün",
+        }])
+
+        async def find_experts(**kwargs):
+            # Cleanup fails while the cancelled lookup unwinds, as when the
+            # session rollback in get_async_session raises
+            try:
+                await asyncio.sleep(10)
+            finally:
+                raise RuntimeError("Database not initialized")
+
+        service.expert_service.find_experts = find_experts
+
+        unhandled = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+        try:
+            await service.suggest_solution("C1", "1.0", "A1100 sıkışma")
+            # Let the expert task finish and be collected
+            for _ in range(3):
+                await asyncio.sleep(0)
+            gc.collect()
+        finally:
+            loop.set_exception_handler(None)
+
+        assert unhandled == []
@@ -5,7 +5,21 @@ import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 
 from src.rag.retriever import SolutionRetriever
-from src.rag.generator import ResponseGenerator
+from src.rag.generator import ResponseGenerator, warmup_llm
+
+
+# Search result returned by the mock vector store
+_MOCK_RESULT = [
+    {
+        "id": "test-id-1",
+        "document": "Hata: Test error\nÇözüm: Test solution",
+        "metadata": {
+            "error_pattern": "Test error pattern",
+            "solution_preview": "Test solution preview",
+        },
+        "similarity": 0.85,
+    }
+]
 
 
 class TestSolutionRetriever:
@@ -15,17 +29,7 @@ class TestSolutionRetriever:
     def mock_vector_store(self):
         """Create a mock vector store."""
         store = MagicMock()
-        store.search_solutions = MagicMock(return_value=[
-            {
-                "id": "test-id-1",
-                "document": "Hata: Test error\nÇözüm: Test solution",
-                "metadata": {
-                    "error_pattern": "Test error pattern",
-                    "solution_preview": "Test solution preview",
-                },
-                "similarity": 0.85,
-            }
-        ])
+        store.search_solutions = MagicMock(return_value=_MOCK_RESULT)
         return store
     
     @pytest.fixture
@@ -111,3 +115,41 @@ class TestResponseGenerator:
             assert result["error_summary"] == "Test error"
             assert result["solution"] == "Test solution"
             assert result["successful"] is True
+    
+    def test_analyze_conversation_cached(self, mock_llm):
+        """Test that re-analyzing the same conversation reuses the result."""
+        mock_llm.invoke = MagicMock(return_value=MagicMock(
+            content="HATA_OZETI: Test error\nCOZUM: Test solution\nBASARILI: evet"
+        ))
+        messages = [
+            {"user": "U1", "text": "Error occurred"},
+            {"user": "U2", "text": "Try this solution"},
+        ]
+        
+        with patch('src.rag.generator.get_llm', return_value=mock_llm):
+            generator = ResponseGenerator()
+            
+            first = generator.analyze_conversation(messages)
+            first["error_summary"] = "mutated"
+            second = generator.analyze_conversation(messages)
+            
+            assert mock_llm.invoke.call_count == 1
+            assert second["error_summary"] == "Test error"
+            
+            generator.analyze_conversation(messages + [{"user": "U1", "text": "Thanks"}])
+            assert mock_llm.invoke.call_count == 2
+    
+    def test_warmup_caps_output_tokens(self, mock_llm):
+        """Test that the warmup ping asks for a single output token."""
+        with patch('src.rag.generator.get_llm', return_value=mock_llm):
+            warmup_llm()
+        
+        mock_llm.bind.assert_called_once_with(max_output_tokens=1)
+        mock_llm.bind.return_value.invoke.assert_called_once()
+    
+    def test_warmup_ignores_failures(self, mock_llm):
+        """Test that a failed warmup does not raise."""
+        mock_llm.bind.return_value.invoke.side_effect = RuntimeError("unreachable")
+        
+        with patch('src.rag.generator.get_llm', return_value=mock_llm):
+            warmup_llm()
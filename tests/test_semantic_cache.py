@@ -0,0 +1,103 @@
+"""
+Tests for the semantic response cache.
+"""
+import pytest
+
+from src.rag.semantic_cache import SemanticCache
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSemanticCache:
+    """Tests for the SemanticCache class."""
+
+    @pytest.fixture
+    def clock(self):
+        """Create a controllable clock."""
+        return FakeClock()
+
+    @pytest.fixture
+    def cache(self, clock):
+        """Create a cache with a small capacity and short TTL."""
+        return SemanticCache(distance_threshold=0.1, maxsize=3, ttl=60.0, clock=clock)
+
+    def test_hit_within_threshold(self, cache):
+        """Test that a nearby query returns the stored response."""
+        cache.store([1.0, 0.0, 0.0], "konveyör çözümü")
+
+        # Cosine distance ~0.005
+        assert cache.check([1.0, 0.1, 0.0]) == "konveyör çözümü"
+
+    def test_hit_ignores_magnitude(self, cache):
+        """Test that scaled embeddings are treated as identical."""
+        cache.store([1.0, 2.0, 3.0], "sensör çözümü")
+
+        assert cache.check([2.0, 4.0, 6.0]) == "sensör çözümü"
+
+    def test_miss_above_threshold(self, cache):
+        """Test that a distant query misses."""
+        cache.store([1.0, 0.0, 0.0], "konveyör çözümü")
+
+        # Cosine distance ~0.29
+        assert cache.check([1.0, 1.0, 0.0]) is None
+
+    def test_returns_closest_entry(self, cache):
+        """Test that the closest of several hits is returned."""
+        cache.store([1.0, 0.2, 0.0], "uzak")
+        cache.store([1.0, 0.05, 0.0], "yakın")
+
+        assert cache.check([1.0, 0.0, 0.0]) == "yakın"
+
+    def test_scopes_are_isolated(self, cache):
+        """Test that responses are only served within their scope."""
+        cache.store([1.0, 0.0, 0.0], "motor", scope=("motor", None))
+
+        assert cache.check([1.0, 0.0, 0.0], scope=("motor", None)) == "motor"
+        assert cache.check([1.0, 0.0, 0.0], scope=("sensör", None)) is None
+        assert cache.check([1.0, 0.0, 0.0]) is None
+
+    def test_ttl_expiry(self, cache, clock):
+        """Test that entries expire after the TTL."""
+        cache.store([1.0, 0.0, 0.0], "konveyör çözümü")
+
+        clock.now = 59.0
+        assert cache.check([1.0, 0.0, 0.0]) == "konveyör çözümü"
+
+        clock.now = 60.0
+        assert cache.check([1.0, 0.0, 0.0]) is None
+        assert len(cache._entries) == 0
+
+    def test_evicts_oldest_at_maxsize(self, cache):
+        """Test that the oldest entry is evicted when the cache is full."""
+        cache.store([1.0, 0.0, 0.0], "ilk")
+        cache.store([0.0, 1.0, 0.0], "ikinci")
+        cache.store([0.0, 0.0, 1.0], "üçüncü")
+        cache.store([1.0, 1.0, 1.0], "dördüncü")
+
+        assert len(cache._entries) == 3
+        assert cache.check([1.0, 0.0, 0.0]) is None
+        assert cache.check([0.0, 1.0, 0.0]) == "ikinci"
+        assert cache.check([1.0, 1.0, 1.0]) == "dördüncü"
+
+    def test_zero_norm_vectors(self, cache):
+        """Test that all-zero embeddings are neither stored nor matched."""
+        cache.store([0.0, 0.0, 0.0], "boş")
+        assert len(cache._entries) == 0
+
+        cache.store([1.0, 0.0, 0.0], "konveyör çözümü")
+        assert cache.check([0.0, 0.0, 0.0]) is None
+
+    def test_clear(self, cache):
+        """Test that clear drops all entries."""
+        cache.store([1.0, 0.0, 0.0], "konveyör çözümü")
+        cache.clear()
+
+        assert cache.check([1.0, 0.0, 0.0]) is None
@@ -0,0 +1,183 @@
+"""
+Tests for the solution indexing write-behind queue.
+"""
+import asyncio
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services import solution_service
+from src.services.solution_service import SolutionService
+
+
+def _item() -> dict:
+    """Build a queued vector store item."""
+    return {
+        "solution_id": str(uuid.uuid4()),
+        "error_pattern": "A1100 şişe sıkışması",
+        "solution_text": "Konveyör hızını düşürün",
+        "metadata": {"category": "konveyör", "machine_type": "A1100"},
+    }
+
+
+class TestIndexQueue:
+    """Tests for SolutionService's batched vector store writes."""
+
+    @pytest.fixture
+    def vector_store(self, monkeypatch):
+        """Replace the vector store with a mock."""
+        store = MagicMock()
+        monkeypatch.setattr(solution_service, "get_vector_store", lambda: store)
+        monkeypatch.setattr(solution_service, "INDEX_RETRY_BASE_DELAY_SECONDS", 0)
+        return store
+
+    @pytest.fixture
+    def repo(self, monkeypatch):
+        """Replace the database session and repository with mocks."""
+        repo = MagicMock()
+        repo.mark_indexed = AsyncMock()
+        repo.get_unindexed = AsyncMock(return_value=[])
+
+        @asynccontextmanager
+        async def fake_session():
+            yield MagicMock()
+
+        monkeypatch.setattr(solution_service, "get_async_session", fake_session)
+        monkeypatch.setattr(solution_service, "SolutionRepository", lambda session: repo)
+        yield repo
+        SolutionService._index_queues.clear()
+
+    @pytest.mark.asyncio
+    async def test_write_retries_then_marks_indexed(self, vector_store, repo):
+        """Test that a transient failure is retried and the rows are marked."""
+        vector_store.add_solutions.side_effect = [RuntimeError("timeout"), None]
+        item = _item()
+
+        await SolutionService._write_index_batch([item])
+
+        assert vector_store.add_solutions.call_count == 2
+        repo.mark_indexed.assert_awaited_once_with([uuid.UUID(item["solution_id"])])
+
+    @pytest.mark.asyncio
+    async def test_write_gives_up_without_marking(self, vector_store, repo):
+        """Test that persistent failures leave rows for reindexing."""
+        vector_store.add_solutions.side_effect = RuntimeError("down")
+
+        await SolutionService._write_index_batch([_item()])
+
+        assert vector_store.add_solutions.call_count == solution_service.INDEX_WRITE_MAX_ATTEMPTS
+        repo.mark_indexed.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_flush_indexes_queued_solutions(self, vector_store, repo):
+        """Test that flushing indexes solutions still waiting in the queue."""
+        queue = SolutionService._get_index_queue()
+        items = [_item(), _item()]
+        for item in items:
+            queue.put_nowait(item)
+
+        await SolutionService.flush_indexed_solutions()
+
+        indexed = [i for call in vector_store.add_solutions.call_args_list for i in call.args[0]]
+        assert indexed == items
+
+    @pytest.mark.asyncio
+    async def test_reindex_queues_unindexed_rows(self, vector_store, repo):
+        """Test that unindexed rows are queued and indexed again."""
+        solution = MagicMock(
+            id=uuid.uuid4(),
+            error_pattern="A1100 şişe sıkışması",
+            solution_text="Konveyör hızını düşürün",
+            error_category="konveyör",
+            machine_type="A1100",
+        )
+        repo.get_unindexed.return_value = [solution]
+
+        queued = await SolutionService.reindex_pending_solutions()
+        await SolutionService.flush_indexed_solutions()
+
+        assert queued == 1
+        [batch] = [call.args[0] for call in vector_store.add_solutions.call_args_list]
+        assert batch[0]["solution_id"] == str(solution.id)
+        assert batch[0]["metadata"] == {"category": "konveyör", "machine_type": "A1100"}
+        repo.mark_indexed.assert_awaited_once_with([solution.id])
+
+    @pytest.mark.asyncio
+    async def test_flush_runs_on_the_owning_loop(self, vector_store, repo, monkeypatch):
+        """Test that a queue created on another running loop is flushed there."""
+        monkeypatch.setattr(solution_service, "INDEX_BATCH_MAX_WAIT_SECONDS", 60)
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever, daemon=True)
+        thread.start()
+        items = [_item(), _item()]
+
+        async def enqueue():
+            for item in items:
+                await SolutionService._get_index_queue().put(item)
+
+        try:
+            asyncio.run_coroutine_threadsafe(enqueue(), other).result(timeout=5)
+            await SolutionService.flush_indexed_solutions()
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join(timeout=5)
+            other.close()
+
+        indexed = [i for call in vector_store.add_solutions.call_args_list for i in call.args[0]]
+        assert indexed == items
+        assert SolutionService._index_queues == {}
+
+    @pytest.mark.asyncio
+    async def test_flush_indexes_queue_of_stopped_loop(self, vector_store, repo):
+        """Test that solutions queued on a loop that stopped are still indexed."""
+        other = asyncio.new_event_loop()
+        items = [_item(), _item()]
+
+        async def enqueue():
+            queue = SolutionService._get_index_queue()
+            for item in items:
+                queue.put_nowait(item)
+
+        try:
+            await asyncio.to_thread(other.run_until_complete, enqueue())
+            await SolutionService.flush_indexed_solutions()
+        finally:
+            other.close()
+
+        indexed = [i for call in vector_store.add_solutions.call_args_list for i in call.args[0]]
+        assert indexed == items
+
+
+class TestSearchCache:
+    """Tests for SolutionService's search result caches."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        """Create a service whose queries all embed to the same vector."""
+        monkeypatch.setattr(solution_service, "embed_text", lambda text: [1.0, 0.0, 0.0])
+        service = SolutionService.__new__(SolutionService)
+        service.rag_chain = MagicMock()
+        service.rag_chain.query.return_value = MagicMock(sources=[{"id": "test-id-1"}])
+        yield service
+        solution_service._search_cache.clear()
+        solution_service._semantic_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_paraphrase_served_from_semantic_cache(self, service):
+        """Test that a close query for the same machine reuses the results."""
+        await service.search_solutions("A1100 şişe sıkışması")
+        results = await service.search_solutions("A1100 sıkıştı")
+
+        assert service.rag_chain.query.call_count == 1
+        assert results[0]["id"] == "test-id-1"
+
+    @pytest.mark.asyncio
+    async def test_machine_in_query_scopes_semantic_cache(self, service):
+        """Test that queries naming different machines never share results."""
+        await service.search_solutions("A1100 motor arızası")
+        await service.search_solutions("A1200 motor arızası")
+
+        assert service.rag_chain.query.call_count == 2
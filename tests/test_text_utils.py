@@ -0,0 +1,79 @@
+"""
+Tests for text utilities.
+"""
+from src.utils.text_utils import extract_code_blocks, format_slack_message
+
+
+class TestExtractCodeBlocks:
+    """Tests for extract_code_blocks."""
+
+    def test_no_code(self):
+        """Test text without code."""
+        assert extract_code_blocks("Konveyör durdu") == []
+        assert extract_code_blocks("") == []
+
+    def test_fenced_block_with_language(self):
+        """Test that the language tag line is dropped."""
+        text = "Log:\n```python\nprint('A1100')\n```"
+
+        assert extract_code_blocks(text) == ["print('A1100')\n"]
+
+    def test_fenced_block_with_non_ascii_language(self):
+        """Test that a non-ASCII language tag is dropped too."""
+        assert extract_code_blocks("```é\na```") == ["a"]
+
+    def test_fenced_block_without_language(self):
+        """Test that a block without a tag is kept whole."""
+        assert extract_code_blocks("```\nERR 42\n```") == ["\nERR 42\n"]
+        assert extract_code_blocks("```ERR 42```") == ["ERR 42"]
+
+    def test_duplicate_blocks(self):
+        """Test that repeated blocks are each returned."""
+        text = "önce ```reset``` sonra yine ```reset```"
+
+        assert extract_code_blocks(text) == ["reset", "reset"]
+
+    def test_inline_code(self):
+        """Test inline code outside fenced blocks."""
+        assert extract_code_blocks("`systemctl restart` ve `ls`") == ["systemctl restart", "ls"]
+
+    def test_fenced_before_inline(self):
+        """Test that fenced blocks come first and are not reported as inline."""
+        text = "`ls` çalıştır ```bash\nls `pwd`\n``` sonra `df`"
+
+        assert extract_code_blocks(text) == ["ls `pwd`\n", "ls", "df"]
+
+    def test_unclosed_fence(self):
+        """Test that inline code is still found next to an unclosed fence."""
+        assert extract_code_blocks("`ls` sonra ``` yarım") == ["ls"]
+
+
+class TestFormatSlackMessage:
+    """Tests for format_slack_message."""
+
+    def test_no_patterns(self):
+        """Test that text is unchanged without bold patterns."""
+        assert format_slack_message("Konveyör durdu") == "Konveyör durdu"
+        assert format_slack_message("") == ""
+
+    def test_bold_case_insensitive(self):
+        """Test that every occurrence is bolded regardless of case."""
+        text = "A1100 arıza, Arıza devam"
+
+        assert format_slack_message(text, ["arıza", "a1100"]) == "*A1100* *arıza*, *Arıza* devam"
+
+    def test_bold_escapes_patterns(self):
+        """Test that patterns are matched literally."""
+        assert format_slack_message("hız (50) ayarı", ["(50)"]) == "hız *(50)* ayarı"
+
+    def test_overlapping_patterns_keep_list_order(self):
+        """Test that an earlier pattern wins over an overlapping later one."""
+        assert format_slack_message("ARIZA", ["rı", "ar"]) == "A*RI*ZA"
+        assert format_slack_message("ARIZA", ["ar", "rı"]) == "*AR*IZA"
+
+    def test_overlaps_are_not_wrapped_twice(self):
+        """Test that a pattern inside an earlier match is not wrapped again."""
+        text = "motor arizasi"
+
+        assert format_slack_message(text, ["motor", "moto", "ariza"]) == "*motor* *ariza*si"
+        assert format_slack_message("ab", ["ab", "b"]) == "*ab*"
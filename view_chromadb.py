@@ -1,58 +1,69 @@
 """ChromaDB içeriğini görüntüleme scripti"""
+import sys
+
 from src.database.vector_store import VectorStore
 
+# Her get() çağrısında okunacak döküman sayısı
+PAGE_SIZE = 500
+
+
+def print_collection(collection, empty_message: str):
+    """Collection içeriğini sayfa sayfa yazdır (embedding'ler okunmaz)"""
+    print(f"\n📊 Toplam döküman sayısı: {collection.count()}")
+
+    offset = 0
+    while True:
+        batch = collection.get(
+            limit=PAGE_SIZE,
+            offset=offset,
+            include=["documents", "metadatas"],
+        )
+        if not batch['ids']:
+            break
+
+        # Sayfanın çıktısını tek bir write ile bas
+        out = []
+        for i, (doc_id, doc, metadata) in enumerate(zip(
+            batch['ids'],
+            batch['documents'],
+            batch['metadatas']
+        ), start=offset):
+            out.append(f"\n--- Döküman {i+1} ---\n")
+            out.append(f"🆔 ID: {doc_id}\n")
+            out.append(f"📝 İçerik: {doc[:200]}...\n" if len(doc) > 200 else f"📝 İçerik: {doc}\n")
+            out.append(f"🏷️  Metadata: {metadata}\n")
+        sys.stdout.write("".join(out))
+
+        offset += len(batch['ids'])
+
+    if not offset:
+        print(empty_message)
+
+
 def view_collections():
     """ChromaDB'deki tüm collection'ları ve içeriklerini görüntüle"""
     vs = VectorStore()
-    
+
     # Solutions collection
     print("\n" + "="*60)
     print("📦 SOLUTIONS COLLECTION")
     print("="*60)
-    
+
     try:
-        solutions = vs.solutions.get()
-        print(f"\n📊 Toplam döküman sayısı: {len(solutions['ids'])}")
-        
-        if solutions['ids']:
-            for i, (doc_id, doc, metadata) in enumerate(zip(
-                solutions['ids'], 
-                solutions['documents'], 
-                solutions['metadatas']
-            )):
-                print(f"\n--- Döküman {i+1} ---")
-                print(f"🆔 ID: {doc_id}")
-                print(f"📝 İçerik: {doc[:200]}..." if len(doc) > 200 else f"📝 İçerik: {doc}")
-                print(f"🏷️  Metadata: {metadata}")
-        else:
-            print("❌ Henüz kayıtlı çözüm yok.")
+        print_collection(vs.solutions, "❌ Henüz kayıtlı çözüm yok.")
     except Exception as e:
         print(f"❌ Hata: {e}")
-    
+
     # Conversations collection
     print("\n" + "="*60)
     print("💬 CONVERSATIONS COLLECTION")
     print("="*60)
-    
+
     try:
-        convos = vs.conversations.get()
-        print(f"\n📊 Toplam döküman sayısı: {len(convos['ids'])}")
-        
-        if convos['ids']:
-            for i, (doc_id, doc, metadata) in enumerate(zip(
-                convos['ids'], 
-                convos['documents'], 
-                convos['metadatas']
-            )):
-                print(f"\n--- Döküman {i+1} ---")
-                print(f"🆔 ID: {doc_id}")
-                print(f"📝 İçerik: {doc[:200]}..." if len(doc) > 200 else f"📝 İçerik: {doc}")
-                print(f"🏷️  Metadata: {metadata}")
-        else:
-            print("❌ Henüz kayıtlı konuşma yok.")
+        print_collection(vs.conversations, "❌ Henüz kayıtlı konuşma yok.")
     except Exception as e:
         print(f"❌ Hata: {e}")
-    
+
     print("\n" + "="*60)
 
 if __name__ == "__main__":